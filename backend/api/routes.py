@@ -1,21 +1,17 @@
-"""API routes for EulerSpace."""
+"""API routes for EulerSpace.
 
-from fastapi import APIRouter, HTTPException
+Engine modules (SymPy, NumPy, SciPy) are imported inside the handlers so that
+importing the app stays cheap; see backend.warmup for how they get loaded
+before a worker reports ready.
+"""
+
+import gzip
+import json
+
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import Optional
-
-from backend.engine.symbolic import (
-    solve_equation, differentiate, integrate, simplify_expr,
-    compute_limit, series_expansion, solve_ode, matrix_operations,
-    generate_plot_data,
-)
-from backend.physics.simulator import (
-    projectile_motion, simple_harmonic_motion, pendulum,
-    wave_equation_1d, electric_field_2d, orbital_mechanics,
-)
-from backend.ai.assistant import (
-    explain_step_by_step, generate_exercises, validate_proof_step,
-)
+from typing import Annotated, Optional, Union
 
 router = APIRouter()
 
@@ -67,9 +63,40 @@ class PlotRequest(BaseModel):
     x_max: float = 10
     points: int = 500
 
+class SurfaceRequest(BaseModel):
+    expression: str
+    x_var: str = "x"
+    y_var: str = "y"
+    x_range: list = [-5, 5]
+    y_range: list = [-5, 5]
+    resolution: int = 100
+
+class ContourRequest(SurfaceRequest):
+    resolution: int = 200
+    levels: Union[int, list] = 10
+
+class ImplicitRequest(BaseModel):
+    equation: str
+    x_var: str = "x"
+    y_var: str = "y"
+    x_range: list = [-5, 5]
+    y_range: list = [-5, 5]
+    resolution: int = 200
+    refine_steps: int = 4
+
+class VolumeRequest(BaseModel):
+    expression: str
+    variables: list = ["x", "y", "z"]
+    x_range: list = [-5, 5]
+    y_range: list = [-5, 5]
+    z_range: list = [-5, 5]
+    resolution: int = 40
+
 
 @router.post("/math/solve")
 async def api_solve(req: SolveRequest):
+    from backend.engine.symbolic import solve_equation
+
     try:
         return solve_equation(req.equation, req.variable)
     except Exception as e:
@@ -78,6 +105,8 @@ async def api_solve(req: SolveRequest):
 
 @router.post("/math/differentiate")
 async def api_differentiate(req: DiffRequest):
+    from backend.engine.symbolic import differentiate
+
     try:
         return differentiate(req.expression, req.variable, req.order)
     except Exception as e:
@@ -86,6 +115,8 @@ async def api_differentiate(req: DiffRequest):
 
 @router.post("/math/integrate")
 async def api_integrate(req: IntegralRequest):
+    from backend.engine.symbolic import integrate
+
     try:
         return integrate(req.expression, req.variable, req.lower, req.upper)
     except Exception as e:
@@ -94,6 +125,8 @@ async def api_integrate(req: IntegralRequest):
 
 @router.post("/math/simplify")
 async def api_simplify(req: SimplifyRequest):
+    from backend.engine.symbolic import simplify_expr
+
     try:
         return simplify_expr(req.expression)
     except Exception as e:
@@ -102,6 +135,8 @@ async def api_simplify(req: SimplifyRequest):
 
 @router.post("/math/limit")
 async def api_limit(req: LimitRequest):
+    from backend.engine.symbolic import compute_limit
+
     try:
         return compute_limit(req.expression, req.variable, req.point)
     except Exception as e:
@@ -110,6 +145,8 @@ async def api_limit(req: LimitRequest):
 
 @router.post("/math/series")
 async def api_series(req: SeriesRequest):
+    from backend.engine.symbolic import series_expansion
+
     try:
         return series_expansion(req.expression, req.variable, req.point, req.order)
     except Exception as e:
@@ -118,6 +155,8 @@ async def api_series(req: SeriesRequest):
 
 @router.post("/math/ode")
 async def api_ode(req: ODERequest):
+    from backend.engine.symbolic import solve_ode
+
     try:
         return solve_ode(req.equation, req.func_name, req.variable)
     except Exception as e:
@@ -126,6 +165,8 @@ async def api_ode(req: ODERequest):
 
 @router.post("/math/matrix")
 async def api_matrix(req: MatrixRequest):
+    from backend.engine.symbolic import matrix_operations
+
     try:
         return matrix_operations(req.matrix, req.operation)
     except Exception as e:
@@ -134,12 +175,166 @@ async def api_matrix(req: MatrixRequest):
 
 @router.post("/math/plot")
 async def api_plot(req: PlotRequest):
+    from backend.engine.symbolic import generate_plot_data
+
     try:
         return generate_plot_data(req.expression, req.variable, req.x_min, req.x_max, req.points)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
+# The plotting handlers are plain functions: a fine grid can take seconds,
+# so FastAPI runs them in its thread pool instead of blocking the event loop.
+
+@router.post("/math/surface")
+def api_surface(req: SurfaceRequest):
+    from backend.engine.plotting import generate_surface_data
+
+    try:
+        return generate_surface_data(
+            req.expression, req.x_var, req.y_var,
+            tuple(req.x_range), tuple(req.y_range), req.resolution,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/math/contour")
+def api_contour(req: ContourRequest):
+    from backend.engine.plotting import generate_contour_data
+
+    try:
+        return generate_contour_data(
+            req.expression, req.x_var, req.y_var,
+            tuple(req.x_range), tuple(req.y_range), req.resolution, req.levels,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/math/implicit")
+def api_implicit(req: ImplicitRequest):
+    from backend.engine.plotting import generate_implicit_data
+
+    try:
+        return generate_implicit_data(
+            req.equation, req.x_var, req.y_var,
+            tuple(req.x_range), tuple(req.y_range), req.resolution, req.refine_steps,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/math/volume")
+def api_volume(req: VolumeRequest):
+    from backend.engine.plotting import generate_volume_data
+
+    try:
+        return generate_volume_data(
+            req.expression, tuple(req.variables), tuple(req.x_range),
+            tuple(req.y_range), tuple(req.z_range), req.resolution,
+        )
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ── Expression Workspaces ───────────────────────────────────
+# A workspace keeps parsed expressions and their derivatives, series and
+# limits in this worker's memory (see backend.engine.workspace).
+
+class WorkspaceRequest(BaseModel):
+    expressions: dict = {}
+
+class WorkspaceExpressionRequest(BaseModel):
+    name: str = "f"
+    expression: str
+
+class WorkspaceDifferentiateRequest(BaseModel):
+    name: str = "f"
+    variable: str = "x"
+    order: int = 1
+    simplify: bool = False
+
+class WorkspaceSeriesRequest(BaseModel):
+    name: str = "f"
+    variable: str = "x"
+    point: str = "0"
+    order: int = 6
+
+class WorkspaceLimitRequest(BaseModel):
+    name: str = "f"
+    variable: str = "x"
+    point: str = "oo"
+
+
+def _in_workspace(workspace_id: str, operation):
+    from backend.engine.workspace import WorkspaceNotFound, get_workspaces
+
+    try:
+        workspace = get_workspaces().get(workspace_id)
+        with workspace.lock:
+            return operation(workspace)
+    except WorkspaceNotFound:
+        raise HTTPException(status_code=404, detail="Workspace not found or expired")
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/math/workspace")
+async def api_workspace_create(req: WorkspaceRequest):
+    from backend.engine.workspace import get_workspaces
+
+    store = get_workspaces()
+    workspace = store.create()
+    try:
+        for name, expression in req.expressions.items():
+            workspace.set_expression(name, str(expression))
+        return workspace.describe(store.ttl)
+    except Exception as e:
+        store.delete(workspace.id)
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.get("/math/workspace/{workspace_id}")
+async def api_workspace_get(workspace_id: str):
+    from backend.engine.workspace import get_workspaces
+
+    return _in_workspace(workspace_id, lambda ws: ws.describe(get_workspaces().ttl))
+
+
+@router.delete("/math/workspace/{workspace_id}")
+async def api_workspace_delete(workspace_id: str):
+    from backend.engine.workspace import WorkspaceNotFound, get_workspaces
+
+    try:
+        get_workspaces().delete(workspace_id)
+    except WorkspaceNotFound:
+        raise HTTPException(status_code=404, detail="Workspace not found or expired")
+    return {"deleted": workspace_id}
+
+
+@router.post("/math/workspace/{workspace_id}/expressions")
+async def api_workspace_expression(workspace_id: str, req: WorkspaceExpressionRequest):
+    return _in_workspace(workspace_id, lambda ws: ws.set_expression(req.name, req.expression))
+
+
+@router.post("/math/workspace/{workspace_id}/differentiate")
+async def api_workspace_differentiate(workspace_id: str, req: WorkspaceDifferentiateRequest):
+    return _in_workspace(workspace_id, lambda ws: ws.differentiate(
+        req.name, req.variable, req.order, req.simplify))
+
+
+@router.post("/math/workspace/{workspace_id}/series")
+async def api_workspace_series(workspace_id: str, req: WorkspaceSeriesRequest):
+    return _in_workspace(workspace_id, lambda ws: ws.series(
+        req.name, req.variable, req.point, req.order))
+
+
+@router.post("/math/workspace/{workspace_id}/limit")
+async def api_workspace_limit(workspace_id: str, req: WorkspaceLimitRequest):
+    return _in_workspace(workspace_id, lambda ws: ws.limit(req.name, req.variable, req.point))
+
+
 # ── Physics Simulations ─────────────────────────────────────
 
 class ProjectileRequest(BaseModel):
@@ -171,6 +366,21 @@ class ElectricFieldRequest(BaseModel):
     y_range: list = [-5, 5]
     resolution: int = 30
 
+class PDERequest(BaseModel):
+    equation: str = "heat"
+    coefficient: float = 1.0
+    x_range: list = [0, 1]
+    y_range: Optional[list] = None
+    nx: int = 101
+    ny: int = 101
+    t_max: float = 1.0
+    dt: Optional[float] = None
+    scheme: str = "explicit"
+    initial: str = "sin(pi*x)"
+    initial_velocity: str = "0"
+    boundary: Optional[dict] = None
+    frame_every: Optional[int] = None
+
 class OrbitalRequest(BaseModel):
     mass_central: float = 1.989e30
     r0: float = 1.496e11
@@ -178,52 +388,359 @@ class OrbitalRequest(BaseModel):
     t_years: float = 1.0
 
 
-@router.post("/physics/projectile")
-async def api_projectile(req: ProjectileRequest):
+SIMULATION_CACHE_CONTROL = "public, max-age=86400"
+
+
+def _if_none_match(request: Request) -> set:
+    """Base ETags listed in If-None-Match (weak prefix and encoding suffix removed)."""
+    tags = set()
+    for tag in request.headers.get("if-none-match", "").split(","):
+        tag = tag.strip()
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag.endswith('-gzip"'):
+            tag = tag[:-6] + '"'
+        if tag:
+            tags.add(tag)
+    return tags
+
+
+def _simulation_response(request: Request, name: str, compute, **params) -> Response:
+    """Serve a deterministic simulation through the shared result store.
+
+    Responses carry a strong ETag and Cache-Control so clients and CDNs can
+    revalidate with If-None-Match and get a 304 instead of the full body.
+    """
+    from backend.physics.store import cached_result
+
+    gzip_ok = "gzip" in request.headers.get("accept-encoding", "")
     try:
-        return projectile_motion(req.v0, req.angle, req.g)
+        body, etag = cached_result(name, params, compute, _if_none_match(request))
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    headers = {"Cache-Control": SIMULATION_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    # Each content-coding is a different representation, so it gets its own ETag.
+    headers["ETag"] = etag[:-1] + '-gzip"' if gzip_ok else etag
+    if body is None:
+        return Response(status_code=304, headers=headers)
+    if gzip_ok:
+        headers["Content-Encoding"] = "gzip"
+    else:
+        body = gzip.decompress(body)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.post("/physics/projectile")
+async def api_projectile(req: ProjectileRequest, request: Request):
+    from backend.physics.simulator import projectile_motion
+
+    return _simulation_response(request, "projectile", projectile_motion,
+                                v0=req.v0, angle_deg=req.angle, g=req.g)
+
 
 @router.post("/physics/shm")
-async def api_shm(req: SHMRequest):
+async def api_shm(req: SHMRequest, request: Request):
+    from backend.physics.simulator import simple_harmonic_motion
+
+    return _simulation_response(request, "shm", simple_harmonic_motion,
+                                amplitude=req.amplitude, omega=req.omega,
+                                phi=req.phi, t_max=req.t_max)
+
+
+@router.post("/physics/pendulum")
+async def api_pendulum(req: PendulumRequest, request: Request):
+    from backend.physics.simulator import pendulum
+
+    return _simulation_response(request, "pendulum", pendulum,
+                                length=req.length, theta0_deg=req.theta0,
+                                g=req.g, t_max=req.t_max)
+
+
+@router.post("/physics/wave")
+async def api_wave(req: WaveRequest, request: Request):
+    from backend.physics.simulator import wave_equation_1d
+
+    return _simulation_response(request, "wave", wave_equation_1d,
+                                length=req.length, c=req.c,
+                                n_modes=req.n_modes, t_max=req.t_max)
+
+
+@router.post("/physics/electric-field")
+async def api_electric_field(req: ElectricFieldRequest, request: Request):
+    from backend.physics.simulator import electric_field_2d
+
+    return _simulation_response(request, "electric_field", electric_field_2d,
+                                charges=req.charges, x_range=tuple(req.x_range),
+                                y_range=tuple(req.y_range), resolution=req.resolution)
+
+
+@router.post("/physics/orbital")
+async def api_orbital(req: OrbitalRequest, request: Request):
+    from backend.physics.simulator import orbital_mechanics
+
+    return _simulation_response(request, "orbital", orbital_mechanics,
+                                mass_central=req.mass_central, r0=req.r0,
+                                v0=req.v0, t_years=req.t_years)
+
+
+@router.post("/physics/pde")
+async def api_pde(req: PDERequest):
+    """Stream a finite-difference simulation as NDJSON: metadata, then frames."""
+    from backend.physics.pde import solve_pde
+
     try:
-        return simple_harmonic_motion(req.amplitude, req.omega, req.phi, req.t_max)
+        meta, frames = solve_pde(
+            req.equation, req.coefficient, tuple(req.x_range),
+            tuple(req.y_range) if req.y_range is not None else None,
+            req.nx, req.ny, req.t_max, req.dt, req.scheme, req.initial,
+            req.initial_velocity, req.boundary, req.frame_every,
+        )
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
+    def lines():
+        yield json.dumps(meta) + "\n"
+        for frame in frames:
+            yield json.dumps(frame) + "\n"
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
+# GET variants take the same parameters as a query string, so browsers and
+# CDNs can cache and revalidate them (POST responses are not cached).
+
+@router.get("/physics/projectile")
+async def api_projectile_get(req: Annotated[ProjectileRequest, Query()], request: Request):
+    return await api_projectile(req, request)
+
+
+@router.get("/physics/shm")
+async def api_shm_get(req: Annotated[SHMRequest, Query()], request: Request):
+    return await api_shm(req, request)
+
+
+@router.get("/physics/pendulum")
+async def api_pendulum_get(req: Annotated[PendulumRequest, Query()], request: Request):
+    return await api_pendulum(req, request)
+
+
+@router.get("/physics/wave")
+async def api_wave_get(req: Annotated[WaveRequest, Query()], request: Request):
+    return await api_wave(req, request)
+
+
+@router.get("/physics/orbital")
+async def api_orbital_get(req: Annotated[OrbitalRequest, Query()], request: Request):
+    return await api_orbital(req, request)
+
+
+# ── Quantum Lab ──────────────────────────────────────────────
+# The quantum handlers are plain functions: a simulation makes many passes
+# over a state of up to millions of amplitudes, so FastAPI runs them in its
+# thread pool instead of blocking the event loop.
+
+class CircuitRequest(BaseModel):
+    n_qubits: int
+    gates: list
+    shots: int = 1024
+    initial_state: int = 0
+    seed: Optional[int] = None
+
+class GroverRequest(BaseModel):
+    n_qubits: int = 3
+    marked: list = [5]
+    iterations: Optional[int] = None
+    shots: int = 1024
+    seed: Optional[int] = None
+
+class QFTRequest(BaseModel):
+    n_qubits: int = 3
+    input_state: int = 1
+    inverse: bool = False
+    shots: int = 0
+    seed: Optional[int] = None
+
+class ShorRequest(BaseModel):
+    N: int = 15
+    a: Optional[int] = None
+    shots: int = 16
+    seed: Optional[int] = None
+
+class BB84Request(BaseModel):
+    n_bits: int = 12
+    eavesdrop: bool = False
+    sample_fraction: float = 0.25
+    seed: Optional[int] = None
+
+
+@router.post("/quantum/circuit")
+def api_quantum_circuit(req: CircuitRequest):
+    from backend.quantum.statevector import run_circuit
 
-@router.post("/physics/pendulum")
-async def api_pendulum(req: PendulumRequest):
     try:
-        return pendulum(req.length, req.theta0, req.g, req.t_max)
+        return run_circuit(req.n_qubits, req.gates, req.shots, req.initial_state, req.seed)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/physics/wave")
-async def api_wave(req: WaveRequest):
+@router.post("/quantum/grover")
+def api_grover(req: GroverRequest):
+    from backend.quantum.algorithms import grover_search
+
     try:
-        return wave_equation_1d(req.length, req.c, req.n_modes, req.t_max)
+        return grover_search(req.n_qubits, req.marked, req.iterations, req.shots, req.seed)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/physics/electric-field")
-async def api_electric_field(req: ElectricFieldRequest):
+@router.post("/quantum/qft")
+def api_qft(req: QFTRequest):
+    from backend.quantum.algorithms import quantum_fourier_transform
+
     try:
-        return electric_field_2d(
-            req.charges, tuple(req.x_range), tuple(req.y_range), req.resolution
-        )
+        return quantum_fourier_transform(req.n_qubits, req.input_state, req.inverse,
+                                         req.shots, req.seed)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
 
-@router.post("/physics/orbital")
-async def api_orbital(req: OrbitalRequest):
+@router.post("/quantum/shor")
+def api_shor(req: ShorRequest):
+    from backend.quantum.algorithms import shor_period_finding
+
+    try:
+        return shor_period_finding(req.N, req.a, req.shots, req.seed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/quantum/bb84")
+def api_bb84(req: BB84Request):
+    from backend.quantum.algorithms import bb84
+
+    try:
+        return bb84(req.n_bits, req.eavesdrop, req.sample_fraction, req.seed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+# ── Crypto Lab ───────────────────────────────────────────────
+# Big integers may be sent as JSON strings, since JavaScript numbers lose
+# precision above 2^53.
+# The number-theory handlers are plain functions: they can run for seconds,
+# so FastAPI runs them in its thread pool instead of blocking the event loop.
+
+class PrimalityRequest(BaseModel):
+    n: Union[int, str]
+    rounds: int = 40
+
+class PrimeRequest(BaseModel):
+    bits: int = 64
+
+class FactorRequest(BaseModel):
+    n: Union[int, str]
+    time_budget: float = 5.0
+    seed: Optional[int] = None
+
+class RSAKeygenRequest(BaseModel):
+    bits: int = 64
+    e: int = 65537
+    seed: Optional[int] = None
+
+class RSABreakRequest(BaseModel):
+    n: Union[int, str]
+    e: int = 65537
+    ciphertext: Optional[Union[int, str]] = None
+    time_budget: float = 5.0
+    seed: Optional[int] = None
+
+class TextRequest(BaseModel):
+    text: str
+
+class VigenereCrackRequest(BaseModel):
+    text: str
+    max_key_length: int = 20
+
+
+@router.post("/crypto/primality")
+def api_primality(req: PrimalityRequest):
+    from backend.crypto.numbertheory import primality_report
+
+    try:
+        return primality_report(int(req.n), req.rounds)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/generate-prime")
+def api_generate_prime(req: PrimeRequest):
+    from backend.crypto.numbertheory import generate_prime
+
+    try:
+        p = generate_prime(req.bits)
+        return {"prime": str(p), "bits": p.bit_length()}
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/factor")
+def api_factor(req: FactorRequest):
+    from backend.crypto.numbertheory import factorize
+
+    try:
+        return factorize(int(req.n), req.time_budget, req.seed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/rsa-keygen")
+def api_rsa_keygen(req: RSAKeygenRequest):
+    from backend.crypto.numbertheory import rsa_keygen
+
+    try:
+        return rsa_keygen(req.bits, req.e, req.seed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/rsa-break")
+def api_rsa_break(req: RSABreakRequest):
+    from backend.crypto.numbertheory import rsa_break
+
+    try:
+        ciphertext = int(req.ciphertext) if req.ciphertext is not None else None
+        return rsa_break(int(req.n), req.e, ciphertext, req.time_budget, req.seed)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/frequency")
+async def api_frequency(req: TextRequest):
+    from backend.crypto.classical import frequency_analysis
+
+    try:
+        return frequency_analysis(req.text)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/caesar-crack")
+async def api_caesar_crack(req: TextRequest):
+    from backend.crypto.classical import caesar_crack
+
+    try:
+        return caesar_crack(req.text)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+
+@router.post("/crypto/vigenere-crack")
+async def api_vigenere_crack(req: VigenereCrackRequest):
+    from backend.crypto.classical import vigenere_crack
+
     try:
-        return orbital_mechanics(req.mass_central, req.r0, req.v0, req.t_years)
+        return vigenere_crack(req.text, req.max_key_length)
     except Exception as e:
         raise HTTPException(status_code=400, detail=str(e))
 
@@ -247,6 +764,8 @@ class ProofRequest(BaseModel):
 
 @router.post("/ai/explain")
 async def api_explain(req: ExplainRequest):
+    from backend.ai.assistant import explain_step_by_step
+
     try:
         return explain_step_by_step(req.expression, req.operation, req.variable)
     except Exception as e:
@@ -255,6 +774,8 @@ async def api_explain(req: ExplainRequest):
 
 @router.post("/ai/exercises")
 async def api_exercises(req: ExerciseRequest):
+    from backend.ai.assistant import generate_exercises
+
     try:
         return generate_exercises(req.topic, req.difficulty, req.count)
     except Exception as e:
@@ -263,6 +784,8 @@ async def api_exercises(req: ExerciseRequest):
 
 @router.post("/ai/validate-proof")
 async def api_validate_proof(req: ProofRequest):
+    from backend.ai.assistant import validate_proof_step
+
     try:
         return validate_proof_step(req.claim, req.justification)
     except Exception as e:
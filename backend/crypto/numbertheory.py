@@ -0,0 +1,354 @@
+"""Number theory for the Crypto Lab: primality, prime generation, factoring.
+
+All arithmetic uses Python integers, so sizes are not limited to 53 bits
+as in the browser. Factoring runs trial division, Fermat's method (close
+primes), Pollard rho (Brent variant) and Lenstra ECM with Montgomery curves,
+interleaved until the time budget runs out.
+"""
+
+import math
+import random
+import time
+
+import numpy as np
+
+SMALL_PRIMES_LIMIT = 10000
+MAX_PRIME_BITS = 1024  # single primes; an RSA modulus has two
+MAX_RSA_BITS = 2 * MAX_PRIME_BITS
+MAX_INPUT_BITS = 4096  # numbers to test or factor
+MAX_ROUNDS = 64
+MAX_FACTOR_TIME = 30.0
+MAX_KEYGEN_ATTEMPTS = 100  # prime pairs tried for one RSA key
+
+
+def _sieve(limit: int) -> np.ndarray:
+    is_prime = np.ones(limit + 1, dtype=bool)
+    is_prime[:2] = False
+    for p in range(2, math.isqrt(limit) + 1):
+        if is_prime[p]:
+            is_prime[p * p::p] = False
+    return np.flatnonzero(is_prime)
+
+
+SMALL_PRIMES = _sieve(SMALL_PRIMES_LIMIT)
+_SMALL_PRIMES_LIST = SMALL_PRIMES.tolist()
+
+# Bases that make Miller-Rabin deterministic for n < 3.3 * 10^24.
+_DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+
+def miller_rabin(n: int, rounds: int = 40, rng: random.Random = None) -> tuple:
+    """Miller-Rabin test. Returns (probably_prime, bases_tested, witness)."""
+    if n < 2:
+        return False, [], None
+    for p in _SMALL_PRIMES_LIST[:25]:
+        if n % p == 0:
+            return n == p, [], None if n == p else p
+
+    d, s = n - 1, 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    if n < _DETERMINISTIC_LIMIT:
+        bases = list(_DETERMINISTIC_BASES)
+    else:
+        rng = rng or random.SystemRandom()
+        bases = [rng.randrange(2, n - 1) for _ in range(rounds)]
+
+    for a in bases:
+        x = pow(a, d, n)
+        if x in (1, n - 1):
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False, bases, a
+    return True, bases, None
+
+
+def is_probable_prime(n: int) -> bool:
+    return miller_rabin(n)[0]
+
+
+def _check_input(n: int):
+    if n.bit_length() > MAX_INPUT_BITS:
+        raise ValueError(f"n must have at most {MAX_INPUT_BITS} bits")
+
+
+def primality_report(n: int, rounds: int = 40) -> dict:
+    _check_input(n)
+    if not 1 <= rounds <= MAX_ROUNDS:
+        raise ValueError(f"rounds must be between 1 and {MAX_ROUNDS}")
+    start = time.perf_counter()
+    prime, bases, witness = miller_rabin(n, rounds)
+    deterministic = n < _DETERMINISTIC_LIMIT
+    return {
+        "n": str(n),
+        "bits": n.bit_length(),
+        "is_prime": prime,
+        "deterministic": deterministic,
+        "bases_tested": len(bases),
+        "witness": str(witness) if witness is not None else None,
+        "error_bound": 0.0 if deterministic or not prime else 4.0 ** -len(bases),
+        "elapsed_ms": (time.perf_counter() - start) * 1000,
+    }
+
+
+def generate_prime(bits: int, rng: random.Random = None) -> int:
+    """Random prime of exactly `bits` bits.
+
+    Candidates are scanned in windows above a random odd start: the small
+    primes cross out composites in the whole window with NumPy slicing, and
+    only the survivors go through Miller-Rabin.
+    """
+    if not 2 <= bits <= MAX_PRIME_BITS:
+        raise ValueError(f"bits must be between 2 and {MAX_PRIME_BITS}")
+    rng = rng or random.SystemRandom()
+    if bits <= 13:
+        candidates = [p for p in _SMALL_PRIMES_LIST if p.bit_length() == bits]
+        return rng.choice(candidates)
+
+    window = max(256, 4 * bits)
+    primes = SMALL_PRIMES[1:min(len(SMALL_PRIMES), 64 + 8 * bits)]
+    while True:
+        # Top two bits set keeps products of two such primes at 2*bits bits.
+        start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        # Offsets are even: candidate i is start + 2*i.
+        composite = np.zeros(window, dtype=bool)
+        residues = np.array([start % int(p) for p in primes], dtype=np.int64)
+        # start + 2i = 0 (mod p)  <=>  i = -start * inv(2) (mod p)
+        first = (-residues * ((primes + 1) // 2)) % primes
+        for p, i in zip(primes.tolist(), first.tolist()):
+            composite[i::p] = True
+        for i in np.flatnonzero(~composite).tolist():
+            candidate = start + 2 * i
+            if candidate.bit_length() != bits:
+                break
+            if is_probable_prime(candidate):
+                return candidate
+
+
+# ── Factoring ───────────────────────────────────────────────
+
+def _trial_division(n: int, limit: int = SMALL_PRIMES_LIMIT):
+    factors = []
+    for p in _SMALL_PRIMES_LIST:
+        if p > limit or p * p > n:
+            break
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    return factors, n
+
+
+def fermat(n: int, max_steps: int = 10000):
+    """Fermat's method: fast when n = p*q with p and q close together."""
+    a = math.isqrt(n)
+    if a * a < n:
+        a += 1
+    for _ in range(max_steps):
+        b2 = a * a - n
+        b = math.isqrt(b2)
+        if b * b == b2:
+            return a - b if 1 < a - b < n else None
+        a += 1
+    return None
+
+
+def pollard_rho(n: int, deadline: float, rng: random.Random, max_iterations: int = None):
+    """Brent's variant of Pollard rho with batched gcds. Returns a factor or None."""
+    if n % 2 == 0:
+        return 2
+    iterations = 0
+    while time.perf_counter() < deadline:
+        y, c, m = rng.randrange(1, n), rng.randrange(1, n), 128
+        g, r, q = 1, 1, 1
+        x = ys = y
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                for _ in range(min(m, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += m
+                iterations += m
+            r *= 2
+            if time.perf_counter() > deadline or (max_iterations and iterations > max_iterations):
+                return None
+        if g == n:
+            # The batch overshot; step back one iteration at a time.
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+    return None
+
+
+def _ecm_curve(n: int, B1: int, rng: random.Random):
+    """One ECM stage-1 trial on a random Suyama curve. Returns a factor or None."""
+    sigma = rng.randrange(6, n - 1)
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    x, z = pow(u, 3, n), pow(v, 3, n)
+    num = pow(v - u, 3, n) * (3 * u + v) % n
+    den = 16 * pow(u, 3, n) * v % n
+    g = math.gcd(den, n)
+    if g != 1:
+        return g if g != n else None
+    a24 = num * pow(den, -1, n) % n
+
+    def double(X, Z):
+        s, d = (X + Z) % n, (X - Z) % n
+        ss, dd = s * s % n, d * d % n
+        t = (ss - dd) % n
+        return ss * dd % n, t * (dd + a24 * t) % n
+
+    def add(X1, Z1, X2, Z2, Xd, Zd):
+        u_ = (X1 - Z1) * (X2 + Z2) % n
+        v_ = (X1 + Z1) * (X2 - Z2) % n
+        s, d = u_ + v_, u_ - v_
+        return Zd * s * s % n, Xd * d * d % n
+
+    def ladder(k, X, Z):
+        R0, R1 = (X, Z), double(X, Z)
+        for bit in bin(k)[3:]:
+            if bit == "1":
+                R0, R1 = add(*R0, *R1, X, Z), double(*R1)
+            else:
+                R0, R1 = double(*R0), add(*R0, *R1, X, Z)
+        return R0
+
+    for p in _SMALL_PRIMES_LIST:
+        if p > B1:
+            break
+        pk = p
+        while pk * p <= B1:
+            pk *= p
+        x, z = ladder(pk, x, z)
+    g = math.gcd(z, n)
+    return g if 1 < g < n else None
+
+
+def ecm(n: int, deadline: float, rng: random.Random, B1: int = 2000, curves: int = None):
+    """Lenstra ECM (stage 1), raising B1 as curves fail. Returns a factor or None."""
+    tried = 0
+    while time.perf_counter() < deadline and (curves is None or tried < curves):
+        g = _ecm_curve(n, B1, rng)
+        tried += 1
+        if g:
+            return g
+        if tried % 8 == 0 and B1 < SMALL_PRIMES_LIMIT:
+            B1 = min(SMALL_PRIMES_LIMIT, B1 * 2)
+    return None
+
+
+def factorize(n: int, time_budget: float = 5.0, seed: int = None) -> dict:
+    """Factor n completely within time_budget seconds, recording each step."""
+    if n < 2:
+        raise ValueError("n must be at least 2")
+    _check_input(n)
+    time_budget = min(max(time_budget, 0.01), MAX_FACTOR_TIME)
+    start = time.perf_counter()
+    deadline = start + time_budget
+    rng = random.Random(seed)
+    steps = []
+
+    def record(method, factor, of):
+        steps.append({"method": method, "factor": str(factor), "of": str(of),
+                      "elapsed_ms": round((time.perf_counter() - start) * 1000, 3)})
+
+    small, rest = _trial_division(n)
+    for p in small:
+        record("trial division", p, n)
+
+    primes, composites = list(small), []
+    stack = [rest] if rest > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            primes.append(m)
+            continue
+        r = math.isqrt(m)
+        if r * r == m:
+            record("perfect square", r, m)
+            stack += [r, r]
+            continue
+        f, method = fermat(m, 2000), "fermat"
+        if f is None:
+            # Alternate rho and ECM in short slices so whichever suits m wins.
+            slice_s = 0.05
+            while f is None and time.perf_counter() < deadline:
+                now = time.perf_counter()
+                f, method = pollard_rho(m, min(deadline, now + slice_s), rng), "pollard rho"
+                if f is None:
+                    now = time.perf_counter()
+                    f, method = ecm(m, min(deadline, now + slice_s), rng), "ecm"
+                slice_s = min(slice_s * 2, 2.0)
+        if f is None:
+            composites.append(m)
+            continue
+        record(method, f, m)
+        stack += [f, m // f]
+
+    return {
+        "n": str(n),
+        "bits": n.bit_length(),
+        "factors": [str(p) for p in sorted(primes)],
+        "unfactored": [str(c) for c in sorted(composites)],
+        "complete": not composites,
+        "steps": steps,
+        "elapsed_ms": round((time.perf_counter() - start) * 1000, 3),
+    }
+
+
+def rsa_keygen(bits: int = 64, e: int = 65537, seed: int = None) -> dict:
+    """RSA key pair with a modulus of `bits` bits."""
+    if not 16 <= bits <= MAX_RSA_BITS:
+        raise ValueError(f"Modulus size must be between 16 and {MAX_RSA_BITS} bits")
+    # phi(n) is even, so an even e is never invertible.
+    if e < 3 or e % 2 == 0:
+        raise ValueError("Public exponent e must be odd and at least 3")
+    rng = random.Random(seed) if seed is not None else random.SystemRandom()
+    for _ in range(MAX_KEYGEN_ATTEMPTS):
+        p = generate_prime(bits // 2, rng)
+        q = generate_prime(bits - bits // 2, rng)
+        phi = (p - 1) * (q - 1)
+        if p != q and math.gcd(e, phi) == 1:
+            break
+    else:
+        raise ValueError(f"No {bits}-bit key found with e = {e} coprime to phi(n); "
+                         "try another exponent or a larger modulus")
+    n = p * q
+    return {"n": str(n), "e": e, "d": str(pow(e, -1, phi)), "p": str(p), "q": str(q),
+            "bits": n.bit_length()}
+
+
+def rsa_break(n: int, e: int = 65537, ciphertext: int = None,
+              time_budget: float = 5.0, seed: int = None) -> dict:
+    """Recover the RSA private key by factoring n, and decrypt if given a ciphertext."""
+    result = factorize(n, time_budget, seed)
+    result["broken"] = False
+    primes = [int(p) for p in result["factors"]]
+    if result["complete"] and len(primes) >= 2:
+        phi = 1
+        for p in set(primes):
+            k = primes.count(p)
+            phi *= (p - 1) * p ** (k - 1)
+        if math.gcd(e, phi) == 1:
+            d = pow(e, -1, phi)
+            result.update(broken=True, d=str(d))
+            if ciphertext is not None:
+                result["plaintext"] = str(pow(ciphertext, d, n))
+    return result
@@ -0,0 +1,389 @@
+"""Multi-variable plotting: surfaces, contours, implicit curves and volumes.
+
+Expressions are lambdified once (and cached) and evaluated on meshgrids in
+row tiles, so memory stays bounded at high resolutions. Contours and
+implicit curves are extracted with a vectorized marching squares; the
+crossings are then refined along the cell edges, and sign changes across a
+pole (such as x = 0 for y - 1/x) are dropped rather than drawn as curves.
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import sympy as sp
+
+from backend.engine.symbolic import safe_parse
+
+# Upper bound on grid points evaluated at once.
+TILE_POINTS = 1 << 16
+
+MAX_RESOLUTION_2D = 1000
+MAX_RESOLUTION_3D = 120
+MAX_CONTOUR_LEVELS = 100
+
+# Regula falsi steps per contour crossing; they also expose poles (see _edge_points).
+CONTOUR_REFINE_STEPS = 2
+
+
+def _parse_equation(expr_str: str) -> sp.Expr:
+    """Parse 'F = G' as F - G, or a bare expression as is."""
+    if "=" in expr_str:
+        left, right = expr_str.split("=", 1)
+        return safe_parse(left.strip()) - safe_parse(right.strip())
+    return safe_parse(expr_str)
+
+
+@lru_cache(maxsize=128)
+def _compile(expr_str: str, variables: tuple):
+    expr = _parse_equation(expr_str)
+    symbols = [sp.Symbol(v) for v in variables]
+    unknown = expr.free_symbols - set(symbols)
+    if unknown:
+        names = ", ".join(sorted(str(s) for s in unknown))
+        raise ValueError(f"Unknown symbol(s) {names}; expected only {', '.join(variables)}")
+    return expr, sp.lambdify(symbols, expr, modules=["numpy"])
+
+
+def _evaluate(func, *axes) -> np.ndarray:
+    """Evaluate func on the meshgrid of axes, tile by tile.
+
+    The result is indexed [y, x] (or [z, y, x]); tiles are slabs along the
+    slowest axis, sized to hold at most TILE_POINTS points.
+    """
+    rev = list(reversed(axes))
+    shape = tuple(len(a) for a in rev)
+    out = np.empty(shape, dtype=np.float64)
+    slab = int(np.prod(shape[1:]))
+    rows = max(1, TILE_POINTS // slab)
+
+    with np.errstate(all="ignore"):
+        for start in range(0, shape[0], rows):
+            stop = min(start + rows, shape[0])
+            grids = np.meshgrid(rev[0][start:stop], *rev[1:], indexing="ij")
+            try:
+                values = np.asarray(func(*reversed(grids)))
+            except (TypeError, ValueError, ZeroDivisionError):
+                values = np.asarray(np.nan)
+            if np.iscomplexobj(values):
+                values = np.where(np.abs(values.imag) < 1e-12, values.real, np.nan)
+            out[start:stop] = np.broadcast_to(values, out[start:stop].shape)
+    return out
+
+
+def _compact(values: np.ndarray, digits: int = 6) -> list:
+    """Round to a fixed number of significant digits and map non-finite to None."""
+    finite = np.isfinite(values)
+    if finite.any():
+        scale = np.max(np.abs(values[finite]))
+        decimals = max(0, digits - int(np.ceil(np.log10(scale)))) if scale > 0 else digits
+        values = np.round(values, decimals)
+    obj = values.astype(object)
+    obj[~finite] = None
+    return obj.tolist()
+
+
+def _axis(lo: float, hi: float, n: int, limit: int) -> np.ndarray:
+    if n < 2 or n > limit:
+        raise ValueError(f"Resolution must be between 2 and {limit}")
+    if not lo < hi:
+        raise ValueError("Range minimum must be less than maximum")
+    return np.linspace(lo, hi, n)
+
+
+# ── Marching squares ────────────────────────────────────────
+
+def _valid_cells(F: np.ndarray) -> np.ndarray:
+    """Cells whose four corners are finite; computed once per grid."""
+    valid = np.isfinite(F)
+    return valid[:-1, :-1] & valid[:-1, 1:] & valid[1:, :-1] & valid[1:, 1:]
+
+
+def _marching_squares(F: np.ndarray, level: float, cells: np.ndarray = None):
+    """Find level-crossing segments on a grid F[y, x].
+
+    Returns (edge_a, edge_b) arrays of edge ids, one pair per segment.
+    Horizontal edge (i, j) joins F[i, j]-F[i, j+1] and has id i*nx + j;
+    vertical edge (i, j) joins F[i, j]-F[i+1, j] and has id H + i*nx + j.
+    `cells` is the mask from _valid_cells, shared by every level of a grid.
+    """
+    ny, nx = F.shape
+    H = ny * nx
+    if cells is None:
+        cells = _valid_cells(F)
+    above = F > level
+
+    # Only cells whose corners disagree are crossed; edge ids are built for those.
+    case = (above[:-1, :-1].view(np.uint8) | above[:-1, 1:].view(np.uint8) << 1
+            | above[1:, 1:].view(np.uint8) << 2 | above[1:, :-1].view(np.uint8) << 3)
+    i, j = np.nonzero((case != 0) & (case != 15) & cells)
+    bl, br = above[i, j], above[i, j + 1]
+    tl, tr = above[i + 1, j], above[i + 1, j + 1]
+    ids = np.stack([
+        i * nx + j,              # bottom
+        H + i * nx + (j + 1),    # right
+        (i + 1) * nx + j,        # top
+        H + i * nx + j,          # left
+    ], axis=-1)
+    crossed = np.stack([bl != br, br != tr, tl != tr, bl != tl], axis=-1)
+    count = crossed.sum(axis=-1)
+
+    # Cells with exactly two crossed edges contribute one segment.
+    two = count == 2
+    order = np.argsort(~crossed[two], axis=-1, kind="stable")[:, :2]
+    edges = np.take_along_axis(ids[two], order, axis=-1)
+    seg_a, seg_b = [edges[:, 0]], [edges[:, 1]]
+
+    # Saddles: disambiguate with the cell-centre value.
+    four = count == 4
+    if four.any():
+        fi, fj = i[four], j[four]
+        centre = (F[fi, fj] + F[fi, fj + 1] + F[fi + 1, fj] + F[fi + 1, fj + 1]) / 4 > level
+        e = ids[four]
+        isolate_br_tl = bl[four] == centre
+        first = np.where(isolate_br_tl[:, None], e[:, [0, 2]], e[:, [3, 1]])
+        second = np.where(isolate_br_tl[:, None], e[:, [1, 3]], e[:, [0, 2]])
+        seg_a += [first[:, 0], first[:, 1]]
+        seg_b += [second[:, 0], second[:, 1]]
+
+    return np.concatenate(seg_a), np.concatenate(seg_b)
+
+
+def _edge_endpoints(edge_ids: np.ndarray, shape: tuple):
+    """Grid indices (i0, j0, i1, j1) of the two nodes of each edge."""
+    ny, nx = shape
+    H = ny * nx
+    vertical = edge_ids >= H
+    local = np.where(vertical, edge_ids - H, edge_ids)
+    i0, j0 = np.divmod(local, nx)
+    i1 = np.where(vertical, i0 + 1, i0)
+    j1 = np.where(vertical, j0, j0 + 1)
+    return i0, j0, i1, j1
+
+
+def _edge_points(edge_ids, F, xs, ys, level, func=None, refine_steps=0):
+    """Locate the crossing on each edge by linear interpolation.
+
+    With `func`, the estimate is refined by `refine_steps` rounds of
+    regula falsi (Illinois variant) evaluated only on the crossing edges,
+    and the returned mask drops edges whose sign change is a pole rather
+    than a zero: there |F - level| at the point is not below both endpoints.
+    """
+    i0, j0, i1, j1 = _edge_endpoints(edge_ids, F.shape)
+    xa, ya, fa = xs[j0], ys[i0], F[i0, j0] - level
+    xb, yb, fb = xs[j1], ys[i1], F[i1, j1] - level
+    denom = np.where(fa == fb, 1.0, fa - fb)
+    t = np.clip(fa / denom, 0.0, 1.0)
+    if func is None:
+        return xa + t * (xb - xa), ya + t * (yb - ya), np.ones(t.shape, dtype=bool)
+
+    def residual(t):
+        ft = np.asarray(func(xa + t * (xb - xa), ya + t * (yb - ya)), dtype=float) - level
+        return np.broadcast_to(ft, t.shape)
+
+    with np.errstate(all="ignore"):
+        lo, hi = np.zeros_like(t), np.ones_like(t)
+        flo, fhi = fa.copy(), fb.copy()
+        for _ in range(refine_steps):
+            ft = residual(t)
+            good = np.isfinite(ft)
+            left = good & (np.sign(ft) == np.sign(flo))
+            right = good & ~left
+            lo, flo = np.where(left, t, lo), np.where(left, ft, flo)
+            hi, fhi = np.where(right, t, hi), np.where(right, ft, fhi)
+            # Illinois: halve the stale endpoint to avoid one-sided convergence.
+            fhi = np.where(left, fhi / 2, fhi)
+            flo = np.where(right, flo / 2, flo)
+            d = flo - fhi
+            t_new = lo + (hi - lo) * np.where(d == 0, 0.5, flo / np.where(d == 0, 1.0, d))
+            t = np.where(good, np.clip(t_new, lo, hi), t)
+        keep = np.abs(residual(t)) <= np.minimum(np.abs(fa), np.abs(fb))
+
+    return xa + t * (xb - xa), ya + t * (yb - ya), keep
+
+
+def _chain(seg_a: np.ndarray, seg_b: np.ndarray) -> list:
+    """Join segments sharing an edge into polylines (lists of edge ids).
+
+    An edge borders at most two cells, so it has at most two neighbours;
+    they are gathered with NumPy and only the walk itself is Python.
+    """
+    src = np.concatenate([seg_a, seg_b])
+    dst = np.concatenate([seg_b, seg_a])
+    order = np.argsort(src, kind="stable")
+    src, dst = src[order], dst[order]
+    edges, first, degree = np.unique(src, return_index=True, return_counts=True)
+    second = np.where(degree > 1, first + 1, first)
+    nb1 = np.searchsorted(edges, dst[first]).tolist()
+    nb2 = np.where(degree > 1, np.searchsorted(edges, dst[second]), -1).tolist()
+
+    lines = []
+    visited = bytearray(len(edges))
+    # Start from open ends first so open curves come out in one piece.
+    starts = np.concatenate([np.flatnonzero(degree == 1), np.arange(len(edges))]).tolist()
+    for start in starts:
+        if visited[start]:
+            continue
+        line = [start]
+        visited[start] = 1
+        current = start
+        while True:
+            a, b = nb1[current], nb2[current]
+            if not visited[a]:
+                nxt = a
+            elif b >= 0 and not visited[b]:
+                nxt = b
+            else:
+                if len(line) > 2 and start in (a, b):
+                    line.append(start)  # closed loop
+                break
+            line.append(nxt)
+            visited[nxt] = 1
+            current = nxt
+        lines.append(line)
+    ids = edges.tolist()
+    return [[ids[k] for k in line] for line in lines]
+
+
+def _trace(F, xs, ys, level, func=None, refine_steps=0, cells=None) -> dict:
+    """Extract one level set as Plotly-ready x/y arrays separated by None."""
+    seg_a, seg_b = _marching_squares(F, level, cells)
+    if len(seg_a) == 0:
+        return {"level": float(level), "x": [], "y": [], "curves": 0}
+
+    lines = _chain(seg_a, seg_b)
+    order = np.fromiter((e for line in lines for e in line), dtype=np.int64)
+    px, py, keep = _edge_points(order, F, xs, ys, level, func, refine_steps)
+    px, py = np.round(px, 10).tolist(), np.round(py, 10).tolist()
+    keep = keep.tolist()
+
+    # Split polylines at edges dropped as poles; single points are not curves.
+    pieces = []
+    pos = 0
+    for line in lines:
+        piece = []
+        for k in range(pos, pos + len(line)):
+            if keep[k]:
+                piece.append(k)
+            else:
+                pieces.append(piece)
+                piece = []
+        pieces.append(piece)
+        pos += len(line)
+
+    out_x, out_y = [], []
+    curves = 0
+    for piece in pieces:
+        if len(piece) < 2:
+            continue
+        if out_x:
+            out_x.append(None)
+            out_y.append(None)
+        out_x.extend(px[k] for k in piece)
+        out_y.extend(py[k] for k in piece)
+        curves += 1
+    return {"level": float(level), "x": out_x, "y": out_y, "curves": curves}
+
+
+# ── Public API ──────────────────────────────────────────────
+
+def generate_surface_data(expr_str: str, x_var: str = "x", y_var: str = "y",
+                          x_range: tuple = (-5, 5), y_range: tuple = (-5, 5),
+                          resolution: int = 100) -> dict:
+    """Sample z = f(x, y) on a grid for a surface plot."""
+    expr, func = _compile(expr_str, (x_var, y_var))
+    xs = _axis(x_range[0], x_range[1], resolution, MAX_RESOLUTION_2D)
+    ys = _axis(y_range[0], y_range[1], resolution, MAX_RESOLUTION_2D)
+    Z = _evaluate(func, xs, ys)
+    finite = Z[np.isfinite(Z)]
+
+    return {
+        "x": xs.tolist(),
+        "y": ys.tolist(),
+        "z": _compact(Z),
+        "z_min": float(finite.min()) if finite.size else None,
+        "z_max": float(finite.max()) if finite.size else None,
+        "latex": sp.latex(expr),
+    }
+
+
+def generate_contour_data(expr_str: str, x_var: str = "x", y_var: str = "y",
+                          x_range: tuple = (-5, 5), y_range: tuple = (-5, 5),
+                          resolution: int = 200, levels=10) -> dict:
+    """Extract contour lines of f(x, y).
+
+    levels: number of evenly spaced levels, or an explicit list of values.
+    """
+    expr, func = _compile(expr_str, (x_var, y_var))
+    xs = _axis(x_range[0], x_range[1], resolution, MAX_RESOLUTION_2D)
+    ys = _axis(y_range[0], y_range[1], resolution, MAX_RESOLUTION_2D)
+    Z = _evaluate(func, xs, ys)
+    finite = Z[np.isfinite(Z)]
+    cells = _valid_cells(Z)
+
+    if isinstance(levels, int):
+        if levels < 1 or levels > MAX_CONTOUR_LEVELS:
+            raise ValueError(f"Levels must be between 1 and {MAX_CONTOUR_LEVELS}")
+        if finite.size == 0:
+            values = []
+        else:
+            values = np.linspace(finite.min(), finite.max(), levels + 2)[1:-1]
+    else:
+        if len(levels) > MAX_CONTOUR_LEVELS:
+            raise ValueError(f"At most {MAX_CONTOUR_LEVELS} contour levels are allowed")
+        values = [float(v) for v in levels]
+
+    return {
+        "contours": [_trace(Z, xs, ys, level, func, CONTOUR_REFINE_STEPS, cells)
+                     for level in values],
+        "latex": sp.latex(expr),
+    }
+
+
+def generate_implicit_data(equation_str: str, x_var: str = "x", y_var: str = "y",
+                           x_range: tuple = (-5, 5), y_range: tuple = (-5, 5),
+                           resolution: int = 200, refine_steps: int = 4) -> dict:
+    """Trace the implicit curve F(x, y) = 0 (or F = G).
+
+    The curve is located by marching squares on a coarse grid; each crossing
+    is then refined along its cell edge, so only points next to the curve
+    are re-evaluated.
+    """
+    expr, func = _compile(equation_str, (x_var, y_var))
+    xs = _axis(x_range[0], x_range[1], resolution, MAX_RESOLUTION_2D)
+    ys = _axis(y_range[0], y_range[1], resolution, MAX_RESOLUTION_2D)
+    F = _evaluate(func, xs, ys)
+
+    curve = _trace(F, xs, ys, 0.0, func, max(0, min(refine_steps, 20)))
+    return {
+        "x": curve["x"],
+        "y": curve["y"],
+        "curves": curve["curves"],
+        "latex": sp.latex(sp.Eq(expr, 0)),
+    }
+
+
+def generate_volume_data(expr_str: str, variables: tuple = ("x", "y", "z"),
+                         x_range: tuple = (-5, 5), y_range: tuple = (-5, 5),
+                         z_range: tuple = (-5, 5), resolution: int = 40) -> dict:
+    """Sample w = f(x, y, z) on a 3D grid for isosurface/volume plots.
+
+    Values are flattened with x varying fastest; expanding the axes in the
+    same order gives the x/y/z arrays Plotly's isosurface expects.
+    """
+    expr, func = _compile(expr_str, tuple(variables))
+    xs = _axis(x_range[0], x_range[1], resolution, MAX_RESOLUTION_3D)
+    ys = _axis(y_range[0], y_range[1], resolution, MAX_RESOLUTION_3D)
+    zs = _axis(z_range[0], z_range[1], resolution, MAX_RESOLUTION_3D)
+    W = _evaluate(func, xs, ys, zs)  # shape (nz, ny, nx)
+    finite = W[np.isfinite(W)]
+
+    return {
+        "x": xs.tolist(),
+        "y": ys.tolist(),
+        "z": zs.tolist(),
+        "value": _compact(W.ravel()),
+        "shape": [len(zs), len(ys), len(xs)],
+        "value_min": float(finite.min()) if finite.size else None,
+        "value_max": float(finite.max()) if finite.size else None,
+        "latex": sp.latex(expr),
+    }
@@ -1,5 +1,7 @@
 """Symbolic mathematics engine powered by SymPy."""
 
+import re
+
 import sympy as sp
 from sympy.parsing.sympy_parser import (
     parse_expr,
@@ -136,12 +138,14 @@ def solve_ode(equation_str: str, func_name: str = "y", variable: str = "x") -> d
     var = sp.Symbol(variable)
     f = sp.Function(func_name)
 
-    # Replace common ODE notation
-    eq_str = equation_str.replace(f"{func_name}''", f"Derivative({func_name}({variable}), {variable}, 2)")
-    eq_str = eq_str.replace(f"{func_name}'", f"Derivative({func_name}({variable}), {variable})")
-    eq_str = eq_str.replace(f"{func_name}", f"{func_name}({variable})")
+    # Replace common ODE notation; bare names become calls, existing calls stay
+    name = re.escape(func_name)
+    eq_str = re.sub(rf"\b{name}''", f"Derivative({func_name}({variable}), {variable}, 2)", equation_str)
+    eq_str = re.sub(rf"\b{name}'", f"Derivative({func_name}({variable}), {variable})", eq_str)
+    eq_str = re.sub(rf"\b{name}\b(?!\s*\()", f"{func_name}({variable})", eq_str)
 
-    expr = safe_parse(eq_str)
+    # Bind the name to the function so y(x) is not read as y*x.
+    expr = parse_expr(eq_str, local_dict={func_name: f}, transformations=TRANSFORMATIONS)
     eq = sp.Eq(expr, 0)
     solution = sp.dsolve(eq, f(var))
 
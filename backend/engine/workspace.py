@@ -0,0 +1,337 @@
+"""Stateful expression workspaces for the calculator.
+
+A workspace keeps parsed expressions and what has been derived from them,
+so follow-up operations reuse earlier work instead of starting over:
+
+- derivatives are stored as a chain per variable; order n+1 is one diff()
+  of the stored order n, and lower orders are lookups;
+- series keep their Taylor coefficients f^(k)(a)/k!, taken from that same
+  chain, so raising the order from n to m costs m - n diff() calls. Where
+  the chain does not apply (poles, Laurent/Puiseux expansions, points at
+  infinity, non-smooth functions) or derivatives swell, series() is used.
+  Lower orders are always truncations of the stored series;
+- limits are memoized per (variable, point).
+
+Workspaces live in the memory of one worker process. Each one has a node
+budget: when its artifacts grow past it, the least recently used ones are
+dropped (the parsed expressions themselves are kept). Workspaces idle for
+longer than the TTL are removed, as are the least recently used ones once
+there are too many.
+
+Configuration (environment):
+    EULERSPACE_WORKSPACE_TTL    idle seconds before a workspace expires
+                                (default: 1800)
+    EULERSPACE_WORKSPACES       maximum number of workspaces per worker
+                                (default: 256)
+"""
+
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+
+import sympy as sp
+
+from backend.engine.symbolic import safe_parse
+
+MAX_EXPRESSIONS = 16
+MAX_NODES = 200_000  # per workspace, summed over expressions and artifacts
+MAX_DERIVATIVE_ORDER = 50
+MAX_SERIES_ORDER = 40
+
+_NON_SMOOTH = (sp.Abs, sp.sign, sp.Piecewise, sp.Heaviside, sp.floor, sp.ceiling,
+               sp.Min, sp.Max, sp.DiracDelta)
+
+
+class WorkspaceNotFound(KeyError):
+    pass
+
+
+def _nodes(expr) -> int:
+    """Size of an expression tree, used for the memory budget."""
+    return sum(1 for _ in sp.preorder_traversal(expr))
+
+
+def _swelling(sizes: list) -> bool:
+    """True once derivative sizes grow geometrically (e.g. tan, rational
+    functions), where series() is far cheaper than further diff() calls."""
+    return len(sizes) > 3 and sizes[-1] > 100 and sizes[-1] > 2.5 * sizes[-3]
+
+
+def _analytic_at(expr, var, pt) -> bool:
+    """False if a power or logarithm is singular at pt.
+
+    A non-integer or negative power of a base that vanishes at pt (x*sqrt(x),
+    x**(5/2), 1/x) has no Taylor series there even when its first few
+    derivatives are finite. Bases whose value cannot be decided count as
+    vanishing.
+    """
+    for p in expr.atoms(sp.Pow):
+        if not p.base.has(var) and not p.exp.has(var):
+            continue
+        if p.exp.is_integer and p.exp.is_nonnegative:
+            continue
+        if not p.base.subs(var, pt).is_nonzero:
+            return False
+    return all(f.args[0].subs(var, pt).is_nonzero for f in expr.atoms(sp.log)
+               if f.has(var))
+
+
+def _point(point: str):
+    return sp.oo if point == "oo" else safe_parse(point)
+
+
+def _truncate(series, var, pt, order: int):
+    """Drop the terms of a stored series at and above `order`."""
+    base = 1 / var if pt in (sp.oo, -sp.oo) else var - pt
+    return series.removeO() + sp.Order(base ** order, (var, pt))
+
+
+class Workspace:
+    """Parsed expressions of one session plus their derived artifacts."""
+
+    def __init__(self, max_nodes: int = MAX_NODES):
+        self.id = secrets.token_urlsafe(12)
+        self.last_used = time.time()
+        self.max_nodes = max_nodes
+        self.expressions = {}  # name -> (source, expr, nodes)
+        # (kind, name, ...) -> [value, nodes], least recently used first
+        self.artifacts = OrderedDict()
+        self.lock = threading.RLock()
+
+    @property
+    def nodes(self) -> int:
+        return (sum(n for _, _, n in self.expressions.values())
+                + sum(a[1] for a in self.artifacts.values()))
+
+    def _expr(self, name: str):
+        if name not in self.expressions:
+            raise ValueError(f"No expression named '{name}' in this workspace")
+        return self.expressions[name][1]
+
+    def _artifact(self, key, default):
+        if key not in self.artifacts:
+            self.artifacts[key] = [default, 0]
+        self.artifacts.move_to_end(key)
+        return self.artifacts[key]
+
+    def _account(self, key=None, nodes: int = 0):
+        """Record an artifact's new size, then evict the least recently used
+        artifacts while the workspace is over its budget."""
+        if key in self.artifacts:
+            self.artifacts[key][1] = nodes
+        excess = self.nodes - self.max_nodes
+        for victim in list(self.artifacts):
+            if excess <= 0:
+                break
+            if victim != key:
+                excess -= self.artifacts.pop(victim)[1]
+        if excess > 0:
+            # Too big to keep even on its own; it is returned but not stored.
+            self.artifacts.pop(key, None)
+
+    def set_expression(self, name: str, source: str) -> dict:
+        if name not in self.expressions and len(self.expressions) >= MAX_EXPRESSIONS:
+            raise ValueError(f"A workspace holds at most {MAX_EXPRESSIONS} expressions")
+        expr = safe_parse(source)
+        nodes = _nodes(expr)
+        if nodes > self.max_nodes // 2:
+            raise ValueError("Expression is too large for a workspace")
+        self.expressions[name] = (source, expr, nodes)
+        for key in [k for k in self.artifacts if k[1] == name]:
+            del self.artifacts[key]
+        self._account()
+        return {"name": name, "expression": str(expr), "latex": sp.latex(expr)}
+
+    def _derivatives(self, name: str, variable: str, order: int, stop_on_swell: bool = False):
+        """Stored derivative chain, extended one diff() at a time up to `order`.
+
+        With `stop_on_swell`, extension stops early once the derivatives start
+        growing geometrically. Returns (artifact, number of orders computed now).
+        """
+        key = ("derivatives", name, variable)
+        entry = self._artifact(key, None)
+        if entry[0] is None:
+            entry[0] = {"chain": [self._expr(name)], "sizes": [0], "simplified": {}}
+        chain, sizes = entry[0]["chain"], entry[0]["sizes"]
+        var = sp.Symbol(variable)
+        computed = 0
+        while len(chain) <= order:
+            if stop_on_swell and _swelling(sizes):
+                break
+            chain.append(sp.diff(chain[-1], var))
+            sizes.append(_nodes(chain[-1]))
+            computed += 1
+        if computed:
+            self._account(key, entry[1] + sum(sizes[-computed:]))
+        return entry, computed
+
+    def differentiate(self, name: str, variable: str = "x", order: int = 1,
+                      simplify: bool = False) -> dict:
+        if not 0 <= order <= MAX_DERIVATIVE_ORDER:
+            raise ValueError(f"Order must be between 0 and {MAX_DERIVATIVE_ORDER}")
+        entry, computed = self._derivatives(name, variable, order)
+        result = entry[0]["chain"][order]
+        out = {
+            "name": name,
+            "order": order,
+            "result": str(result),
+            "latex": sp.latex(result),
+            "reused_orders": order - computed,
+            "computed_orders": computed,
+        }
+        if simplify:
+            simplified = entry[0]["simplified"]
+            if order not in simplified:
+                simplified[order] = sp.simplify(result)
+                entry[1] += _nodes(simplified[order])
+                self._account(("derivatives", name, variable), entry[1])
+            out["simplified"] = sp.latex(simplified[order])
+        return out
+
+    def _taylor_coefficients(self, name, variable, var, pt, coefficients, order):
+        """Extend Taylor coefficients f^(k)(pt)/k! from the derivative chain.
+
+        Returns False when the chain is not usable: the point is not finite,
+        the expression is not smooth or analytic there, or its derivatives
+        swell faster than series() would take.
+        """
+        expr = self._expr(name)
+        if not pt.is_finite or expr.has(*_NON_SMOOTH) or not _analytic_at(expr, var, pt):
+            return False
+        entry, _ = self._derivatives(name, variable, order - 1, stop_on_swell=True)
+        chain = entry[0]["chain"]
+        if len(chain) < order:
+            return False
+        for k in range(len(coefficients), order):
+            c = chain[k].subs(var, pt)
+            if not c.is_finite:
+                return False
+            coefficients.append(c / sp.factorial(k))
+        return True
+
+    def series(self, name: str, variable: str = "x", point: str = "0", order: int = 6) -> dict:
+        if not 1 <= order <= MAX_SERIES_ORDER:
+            raise ValueError(f"Order must be between 1 and {MAX_SERIES_ORDER}")
+        expr = self._expr(name)
+        var = sp.Symbol(variable)
+        pt = _point(point)
+        key = ("series", name, variable, str(pt))
+        entry = self._artifact(key, None)
+        if entry[0] is None:
+            # stored series, its order, Taylor coefficients (None: use series())
+            entry[0] = [None, 0, []]
+        stored = entry[0]
+
+        source = "stored"
+        if stored[1] < order:
+            coefficients = stored[2]
+            if coefficients is not None and self._taylor_coefficients(
+                    name, variable, var, pt, coefficients, order):
+                base = var - pt
+                result = (sp.Add(*(c * base ** k for k, c in enumerate(coefficients[:order])))
+                          + sp.Order(base ** order, (var, pt)))
+                source = "derivatives"
+            else:
+                stored[2] = None
+                result, source = sp.series(expr, var, pt, order), "series"
+            stored[0], stored[1] = result, order
+            self._account(key, _nodes(result) + sum(_nodes(c) for c in stored[2] or []))
+
+        result = stored[0] if stored[1] == order else _truncate(stored[0], var, pt, order)
+        return {
+            "name": name,
+            "order": order,
+            "result": str(result),
+            "latex": sp.latex(result),
+            "source": source,
+            "stored_order": stored[1],
+        }
+
+    def limit(self, name: str, variable: str = "x", point: str = "oo") -> dict:
+        expr = self._expr(name)
+        var = sp.Symbol(variable)
+        key = ("limit", name, variable, point)
+        entry = self._artifact(key, None)
+        cached = entry[0] is not None
+        if not cached:
+            entry[0] = sp.limit(expr, var, _point(point))
+            self._account(key, _nodes(entry[0]))
+        return {
+            "name": name,
+            "result": str(entry[0]),
+            "latex": sp.latex(entry[0]),
+            "cached": cached,
+        }
+
+    def describe(self, ttl: float) -> dict:
+        return {
+            "id": self.id,
+            "expressions": {n: str(e) for n, (_, e, _) in self.expressions.items()},
+            "artifacts": [list(k) for k in self.artifacts],
+            "nodes": self.nodes,
+            "max_nodes": self.max_nodes,
+            "expires_in": max(0.0, self.last_used + ttl - time.time()),
+        }
+
+
+class WorkspaceStore:
+    """In-process registry of workspaces with idle expiry and an LRU cap."""
+
+    def __init__(self, ttl: float, max_workspaces: int):
+        self.ttl = ttl
+        self.max_workspaces = max_workspaces
+        self._workspaces = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _expire(self, now: float):
+        while self._workspaces:
+            oldest = next(iter(self._workspaces.values()))
+            if now - oldest.last_used <= self.ttl:
+                break
+            self._workspaces.popitem(last=False)
+
+    def create(self) -> Workspace:
+        workspace = Workspace()
+        with self._lock:
+            self._expire(time.time())
+            while len(self._workspaces) >= self.max_workspaces:
+                self._workspaces.popitem(last=False)
+            self._workspaces[workspace.id] = workspace
+        return workspace
+
+    def get(self, workspace_id: str) -> Workspace:
+        now = time.time()
+        with self._lock:
+            self._expire(now)
+            workspace = self._workspaces.get(workspace_id)
+            if workspace is None:
+                raise WorkspaceNotFound(workspace_id)
+            workspace.last_used = now
+            self._workspaces.move_to_end(workspace_id)
+        return workspace
+
+    def delete(self, workspace_id: str):
+        with self._lock:
+            if self._workspaces.pop(workspace_id, None) is None:
+                raise WorkspaceNotFound(workspace_id)
+
+    def __len__(self):
+        return len(self._workspaces)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_workspaces() -> WorkspaceStore:
+    """Return the process-wide WorkspaceStore."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = WorkspaceStore(
+                float(os.environ.get("EULERSPACE_WORKSPACE_TTL", "1800")),
+                int(os.environ.get("EULERSPACE_WORKSPACES", "256")),
+            )
+    return _store
@@ -0,0 +1,406 @@
+"""Load-testing harness that replays classroom traffic against the API.
+
+Run in-process (ASGI transport, no network):
+
+    python -m backend.loadtest --users 200 --duration 30
+
+Against an already running server:
+
+    python -m backend.loadtest --url http://localhost:8000 --users 200
+
+Or spawn a local uvicorn with a given worker count, so configurations can be
+compared from a script:
+
+    python -m backend.loadtest --workers 4 --users 200 --json w4.json
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import socket
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+import httpx
+
+
+# ── Traffic definition ──────────────────────────────────────
+#
+# Each scenario belongs to one traffic kind:
+#   burst   - the whole class submits the same exercise at once
+#   typical - ordinary, varied requests
+#   hard    - long-tail expressions that are expensive for SymPy
+#   heavy   - simulations with large payloads
+#
+# A scenario with "then" is a session: the POST creates a resource and each
+# (method, suffix, payload) step is sent to <path>/<id><suffix>. Workspaces
+# live in one worker's memory, so against several workers without sticky
+# routing the follow-ups show up as 404 client errors.
+
+SCENARIOS = [
+    # Math engine
+    {"kind": "burst", "path": "/api/math/differentiate",
+     "payload": {"expression": "x^2*sin(x)", "variable": "x"}},
+    {"kind": "burst", "path": "/api/math/solve",
+     "payload": {"equation": "x^2 - 5x + 6 = 0", "variable": "x"}},
+    {"kind": "burst", "path": "/api/math/plot",
+     "payload": {"expression": "sin(x)/x", "x_min": -10, "x_max": 10}},
+    {"kind": "typical", "path": "/api/math/integrate",
+     "payload": {"expression": "x*exp(x)", "variable": "x"}},
+    {"kind": "typical", "path": "/api/math/integrate",
+     "payload": {"expression": "1/(1+x^2)", "lower": "0", "upper": "1"}},
+    {"kind": "typical", "path": "/api/math/simplify",
+     "payload": {"expression": "(x^2 - 1)/(x - 1)"}},
+    {"kind": "typical", "path": "/api/math/limit",
+     "payload": {"expression": "sin(x)/x", "point": "0"}},
+    {"kind": "typical", "path": "/api/math/series",
+     "payload": {"expression": "exp(x)", "order": 6}},
+    {"kind": "typical", "path": "/api/math/matrix",
+     "payload": {"matrix": [[1, 2], [3, 4]], "operation": "determinant"}},
+    {"kind": "typical", "path": "/api/math/ode",
+     "payload": {"equation": "y'' + y"}},
+    {"kind": "typical", "path": "/api/math/workspace",
+     "payload": {"expressions": {"f": "exp(sin(x))"}},
+     "then": [("POST", "/differentiate", {"name": "f", "order": 3}),
+              ("POST", "/series", {"name": "f", "order": 8}),
+              ("POST", "/expressions", {"name": "g", "expression": "x*sqrt(1+x)"}),
+              ("POST", "/series", {"name": "g", "order": 6}),
+              ("POST", "/limit", {"name": "f", "point": "0"}),
+              ("GET", "", None),
+              ("DELETE", "", None)]},
+    {"kind": "typical", "path": "/api/math/implicit",
+     "payload": {"equation": "x^2 + y^2 = 9", "resolution": 200}},
+    {"kind": "typical", "path": "/api/math/contour",
+     "payload": {"expression": "x^2 - y^2", "resolution": 200, "levels": 10}},
+    {"kind": "hard", "path": "/api/math/integrate",
+     "payload": {"expression": "x^3*exp(x)*sin(x)", "variable": "x"}},
+    {"kind": "hard", "path": "/api/math/simplify",
+     "payload": {"expression": "(sin(x)^4 - cos(x)^4)/(sin(x)^2 - cos(x)^2) + tan(x)^2*cos(x)^2"}},
+    {"kind": "hard", "path": "/api/math/series",
+     "payload": {"expression": "tan(sin(x))", "order": 12}},
+    {"kind": "hard", "path": "/api/math/matrix",
+     "payload": {"matrix": [[4, 1, 2, 0], [1, 3, 0, 1], [2, 0, 5, 1], [0, 1, 1, 2]],
+                 "operation": "eigenvalues"}},
+    {"kind": "heavy", "path": "/api/math/surface",
+     "payload": {"expression": "sin(x)*cos(y)", "resolution": 300}},
+    {"kind": "heavy", "path": "/api/math/contour",
+     "payload": {"expression": "sin(x*y) + x/3", "resolution": 1000, "levels": 50}},
+    {"kind": "heavy", "path": "/api/math/implicit",
+     "payload": {"equation": "tan(x*y) - 1", "resolution": 1000}},
+    {"kind": "heavy", "path": "/api/math/volume",
+     "payload": {"expression": "x^2 + y^2 - z^2", "resolution": 80}},
+    # Physics
+    {"kind": "burst", "path": "/api/physics/projectile",
+     "payload": {"v0": 20, "angle": 45}},
+    {"kind": "typical", "path": "/api/physics/shm",
+     "payload": {"amplitude": 1, "omega": 2}},
+    {"kind": "typical", "path": "/api/physics/pendulum",
+     "payload": {"length": 1, "theta0": 30}},
+    {"kind": "heavy", "path": "/api/physics/wave",
+     "payload": {"length": 1, "c": 1, "n_modes": 20, "t_max": 4}},
+    {"kind": "heavy", "path": "/api/physics/electric-field",
+     "payload": {"charges": [{"x": -1, "y": 0, "q": 1}, {"x": 1, "y": 0, "q": -1},
+                             {"x": 0, "y": 2, "q": 1}],
+                 "resolution": 80}},
+    {"kind": "heavy", "path": "/api/physics/orbital",
+     "payload": {"t_years": 5}},
+    {"kind": "heavy", "path": "/api/physics/pde",
+     "payload": {"equation": "wave", "nx": 201, "t_max": 2, "initial": "sin(pi*x)"}},
+    {"kind": "heavy", "path": "/api/physics/pde",
+     "payload": {"equation": "heat", "x_range": [0, 1], "y_range": [0, 1], "nx": 81, "ny": 81,
+                 "t_max": 0.05, "dt": 0.001, "scheme": "crank-nicolson",
+                 "initial": "sin(pi*x)*sin(pi*y)"}},
+    # AI assistant
+    {"kind": "burst", "path": "/api/ai/exercises",
+     "payload": {"topic": "derivatives", "difficulty": "medium"}},
+    {"kind": "typical", "path": "/api/ai/explain",
+     "payload": {"expression": "x^2 + sin(x)", "operation": "differentiate"}},
+    {"kind": "typical", "path": "/api/ai/validate-proof",
+     "payload": {"claim": "sin(x)^2 + cos(x)^2 - 1"}},
+    {"kind": "hard", "path": "/api/ai/exercises",
+     "payload": {"topic": "integrals", "difficulty": "hard"}},
+]
+
+MIXES = {
+    "classroom": {"burst": 0.45, "typical": 0.35, "hard": 0.1, "heavy": 0.1},
+    "burst": {"burst": 1.0},
+    "typical": {"typical": 1.0},
+    "longtail": {"typical": 0.5, "hard": 0.5},
+    "heavy": {"heavy": 1.0},
+}
+
+
+def pick_scenarios(mix: str, rng: random.Random, n: int) -> list:
+    """Draw n scenarios according to the kind weights of a traffic mix."""
+    weights = MIXES[mix]
+    pool, pool_weights = [], []
+    for s in SCENARIOS:
+        w = weights.get(s["kind"], 0)
+        if w <= 0:
+            continue
+        same_kind = sum(1 for o in SCENARIOS if o["kind"] == s["kind"])
+        pool.append(s)
+        pool_weights.append(w / same_kind)
+    if not pool:
+        raise ValueError(f"Mix '{mix}' selects no scenarios")
+    return rng.choices(pool, weights=pool_weights, k=n)
+
+
+# ── Measurement ─────────────────────────────────────────────
+
+def percentile(sorted_values: list, q: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q / 100 * len(sorted_values))) - 1))
+    return sorted_values[idx]
+
+
+def summarize(samples: list, elapsed: float) -> dict:
+    """Aggregate (path, status, latency) samples into a report."""
+    def stats(rows):
+        lat = sorted(r[2] for r in rows)
+        # Server errors and transport failures measure load; a 4xx is a bad
+        # payload and would fail the same way at any concurrency.
+        errors = sum(1 for r in rows if r[1] is None or r[1] >= 500)
+        client_errors = sum(1 for r in rows if r[1] is not None and 400 <= r[1] < 500)
+        return {
+            "requests": len(rows),
+            "errors": errors,
+            "error_rate": errors / len(rows) if rows else 0.0,
+            "client_errors": client_errors,
+            "client_error_rate": client_errors / len(rows) if rows else 0.0,
+            "throughput": len(rows) / elapsed if elapsed > 0 else 0.0,
+            "p50_ms": percentile(lat, 50) * 1000,
+            "p95_ms": percentile(lat, 95) * 1000,
+            "p99_ms": percentile(lat, 99) * 1000,
+            "max_ms": (lat[-1] * 1000) if lat else 0.0,
+        }
+
+    by_route = defaultdict(list)
+    for row in samples:
+        by_route[row[0]].append(row)
+
+    report = stats(samples)
+    report["elapsed_s"] = elapsed
+    report["routes"] = {path: stats(rows) for path, rows in sorted(by_route.items())}
+    return report
+
+
+async def _request(client: httpx.AsyncClient, method: str, url: str, payload, route: str,
+                   samples: list):
+    start = time.perf_counter()
+    try:
+        resp = await client.request(method, url, json=payload)
+    except httpx.HTTPError:
+        resp = None
+    samples.append((route, resp.status_code if resp is not None else None,
+                    time.perf_counter() - start))
+    return resp
+
+
+async def _send(client: httpx.AsyncClient, scenario: dict, samples: list):
+    path = scenario["path"]
+    resp = await _request(client, "POST", path, scenario["payload"], path, samples)
+    if "then" not in scenario or resp is None or resp.status_code != 200:
+        return
+    # Session scenario: follow-up requests against the resource just created.
+    resource = f"{path}/{resp.json()['id']}"
+    for method, suffix, payload in scenario["then"]:
+        await _request(client, method, resource + suffix, payload,
+                       path + "/{id}" + suffix, samples)
+
+
+async def run_load(client: httpx.AsyncClient, mix: str = "classroom", users: int = 50,
+                   duration: float = 10.0, think_time: float = 0.0, seed: int = 0) -> dict:
+    """Drive `users` concurrent virtual students for `duration` seconds."""
+    rng = random.Random(seed)
+    samples = []
+    deadline = time.perf_counter() + duration
+
+    async def student(student_rng):
+        while time.perf_counter() < deadline:
+            scenario = pick_scenarios(mix, student_rng, 1)[0]
+            await _send(client, scenario, samples)
+            if think_time > 0:
+                await asyncio.sleep(student_rng.expovariate(1 / think_time))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(student(random.Random(rng.random())) for _ in range(users)))
+    return summarize(samples, time.perf_counter() - start)
+
+
+async def find_saturation(client: httpx.AsyncClient, scenario: dict, max_users: int = 256,
+                          requests_per_level: int = 64, min_gain: float = 0.1,
+                          max_error_rate: float = 0.01) -> dict:
+    """Double concurrency on one route until throughput stops improving.
+
+    The saturation point is the last concurrency level that still raised
+    throughput by at least `min_gain` without exceeding `max_error_rate`
+    (server errors and transport failures; 4xx responses do not count).
+    """
+    levels = []
+    saturation = None
+    users = 1
+    best = 0.0
+    while users <= max_users:
+        samples = []
+        per_user = max(1, requests_per_level // users)
+
+        async def worker():
+            for _ in range(per_user):
+                await _send(client, scenario, samples)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(users)))
+        level = summarize(samples, time.perf_counter() - start)
+        level.pop("routes")
+        level["users"] = users
+        levels.append(level)
+
+        if level["error_rate"] > max_error_rate or level["throughput"] < best * (1 + min_gain):
+            saturation = levels[-2]["users"] if len(levels) > 1 else users
+            break
+        best = level["throughput"]
+        users *= 2
+
+    return {
+        "path": scenario["path"],
+        "kind": scenario["kind"],
+        "saturation_users": saturation if saturation is not None else levels[-1]["users"],
+        "saturated": saturation is not None,
+        "levels": levels,
+    }
+
+
+# ── Targets ─────────────────────────────────────────────────
+
+def _in_process_client(timeout: float) -> httpx.AsyncClient:
+    from backend import warmup
+    from backend.main import app
+    # The ASGI transport does not run the lifespan, so warm up explicitly.
+    warmup.run()
+    transport = httpx.ASGITransport(app=app)
+    return httpx.AsyncClient(transport=transport, base_url="http://loadtest", timeout=timeout)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_uvicorn(workers: int, port: int = 0, startup_timeout: float = 60.0):
+    """Start `uvicorn backend.main:app` locally and wait until /ready answers."""
+    port = port or _free_port()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app",
+         "--host", "127.0.0.1", "--port", str(port), "--workers", str(workers),
+         "--log-level", "warning"],
+    )
+    url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + startup_timeout
+    while time.monotonic() < deadline:
+        if proc.poll() is not None:
+            raise RuntimeError(f"uvicorn exited with code {proc.returncode}")
+        try:
+            if httpx.get(f"{url}/ready", timeout=1.0).status_code == 200:
+                return proc, url
+        except httpx.HTTPError:
+            pass
+        time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError("uvicorn did not become ready in time")
+
+
+async def run(args) -> dict:
+    proc = None
+    if args.workers:
+        proc, url = spawn_uvicorn(args.workers, args.port)
+    else:
+        url = args.url
+
+    limits = httpx.Limits(max_connections=max(args.users, args.max_users) + 10)
+    if url:
+        client = httpx.AsyncClient(base_url=url, timeout=args.timeout, limits=limits)
+    else:
+        client = _in_process_client(args.timeout)
+
+    try:
+        async with client:
+            report = {
+                "target": url or "in-process",
+                "workers": args.workers,
+                "mix": args.mix,
+                "users": args.users,
+            }
+            report.update(await run_load(client, args.mix, args.users, args.duration,
+                                         args.think_time, args.seed))
+            if args.saturation:
+                seen = set()
+                report["saturation"] = []
+                for s in SCENARIOS:
+                    if s["path"] in seen:
+                        continue
+                    seen.add(s["path"])
+                    report["saturation"].append(
+                        await find_saturation(client, s, args.max_users, args.requests_per_level)
+                    )
+            return report
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+
+def print_report(report: dict):
+    print(f"target={report['target']} mix={report['mix']} users={report['users']} "
+          f"elapsed={report['elapsed_s']:.1f}s")
+    print(f"total: {report['requests']} req, {report['throughput']:.1f} req/s, "
+          f"errors {report['error_rate']:.2%}, "
+          f"client errors {report['client_error_rate']:.2%}, p50 {report['p50_ms']:.1f}ms "
+          f"p95 {report['p95_ms']:.1f}ms p99 {report['p99_ms']:.1f}ms")
+    print(f"{'route':40} {'req':>6} {'req/s':>8} {'err%':>6} {'4xx%':>6} {'p50':>8} {'p95':>8} {'p99':>8}")
+    for path, r in report["routes"].items():
+        print(f"{path:40} {r['requests']:6d} {r['throughput']:8.1f} {r['error_rate'] * 100:6.1f} "
+              f"{r['client_error_rate'] * 100:6.1f} {r['p50_ms']:8.1f} {r['p95_ms']:8.1f} {r['p99_ms']:8.1f}")
+    for sat in report.get("saturation", []):
+        peak = max(level["throughput"] for level in sat["levels"])
+        mark = "" if sat["saturated"] else " (not reached)"
+        print(f"saturation {sat['path']:32} at {sat['saturation_users']} users, "
+              f"peak {peak:.1f} req/s{mark}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Replay classroom traffic against EulerSpace.")
+    parser.add_argument("--url", help="base URL of a running server (default: in-process)")
+    parser.add_argument("--workers", type=int, default=0,
+                        help="spawn a local uvicorn with this many workers")
+    parser.add_argument("--port", type=int, default=0, help="port for the spawned uvicorn")
+    parser.add_argument("--mix", choices=sorted(MIXES), default="classroom")
+    parser.add_argument("--users", type=int, default=50, help="concurrent virtual students")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds of traffic")
+    parser.add_argument("--think-time", type=float, default=0.0,
+                        help="mean pause between a student's requests, in seconds")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--saturation", action="store_true",
+                        help="also ramp concurrency per route to find saturation points")
+    parser.add_argument("--max-users", type=int, default=256)
+    parser.add_argument("--requests-per-level", type=int, default=64)
+    parser.add_argument("--json", help="write the full report to this file")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(report, fh, indent=2)
+    return report
+
+
+if __name__ == "__main__":
+    main()
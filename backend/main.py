@@ -1,14 +1,26 @@
 """EulerSpace Backend - FastAPI Application."""
 
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
 
+from backend import warmup
 from backend.api.routes import router
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warmup.start()
+    yield
+
+
 app = FastAPI(
     title="EulerSpace",
     description="Mathematical & Physics Laboratory Platform",
     version="0.1.0",
+    lifespan=lifespan,
 )
 
 app.add_middleware(
@@ -38,4 +50,17 @@ async def root():
 
 @app.get("/health")
 async def health():
+    """Liveness: the process is up and serving requests."""
     return {"status": "ok"}
+
+
+@app.get("/ready")
+async def ready():
+    """Readiness: engines are loaded and the warm-up phase has finished."""
+    body = {
+        "status": "ready" if warmup.state["ready"] else "warming_up",
+        "warmup": warmup.state["steps"],
+    }
+    if warmup.state["error"]:
+        body["warmup_error"] = warmup.state["error"]
+    return JSONResponse(body, status_code=200 if warmup.state["ready"] else 503)
@@ -0,0 +1,347 @@
+"""Finite-difference solvers for the heat (diffusion) and wave equations.
+
+    heat / diffusion:  u_t  = a   * lap(u)
+    wave:              u_tt = c^2 * lap(u)
+
+on a uniform grid in 1D or 2D. Stencils use NumPy slicing only. Schemes:
+
+    explicit         FTCS for heat, leapfrog for wave; dt is checked against
+                     the CFL limit (and chosen from it when not given)
+    crank-nicolson   implicit and unconditionally stable; the system matrix
+                     is factored once (tridiagonal banded solve in 1D, sparse
+                     LU in 2D) and reused for every step
+
+Initial and boundary conditions are expressions parsed with safe_parse in
+the variables x, (y,) t. Each side takes {"type": "dirichlet", "value": g}
+(u = g) or {"type": "neumann", "value": g} (outward normal derivative = g,
+first-order). Frames are produced lazily every k-th step, so only the
+current time levels are kept in memory.
+"""
+
+import math
+
+import numpy as np
+import sympy as sp
+from scipy.linalg import solve_banded
+from scipy.sparse import diags, identity, kron
+from scipy.sparse.linalg import splu
+
+from backend.engine.symbolic import safe_parse
+
+EQUATIONS = ("heat", "diffusion", "wave")
+SCHEMES = ("explicit", "crank-nicolson")
+
+MAX_POINTS_1D = 10000
+MAX_POINTS_2D = 500 * 500
+MAX_STEPS = 200000
+MAX_WORK = 500_000_000  # grid points x time steps
+DEFAULT_FRAMES = 100
+DEFAULT_IMPLICIT_STEPS = 200
+
+
+def _field(expr_str: str, names: tuple):
+    """Compile an expression of the given variables into a vectorized function."""
+    expr = safe_parse(str(expr_str))
+    symbols = [sp.Symbol(n) for n in names]
+    unknown = expr.free_symbols - set(symbols)
+    if unknown:
+        raise ValueError(
+            f"Unknown symbol(s) {', '.join(sorted(map(str, unknown)))} in '{expr_str}'; "
+            f"allowed: {', '.join(names)}"
+        )
+    f = sp.lambdify(symbols, expr, modules=["numpy"])
+
+    def evaluate(*args):
+        with np.errstate(all="ignore"):
+            value = np.asarray(f(*args), dtype=float)
+        return np.broadcast_to(value, np.broadcast(*args).shape)
+
+    return evaluate
+
+
+def _laplacian(u: np.ndarray, dx: float, dy: float = None) -> np.ndarray:
+    """Second-order Laplacian on the interior nodes."""
+    if u.ndim == 1:
+        return (u[2:] - 2 * u[1:-1] + u[:-2]) / dx ** 2
+    return ((u[1:-1, 2:] - 2 * u[1:-1, 1:-1] + u[1:-1, :-2]) / dx ** 2
+            + (u[2:, 1:-1] - 2 * u[1:-1, 1:-1] + u[:-2, 1:-1]) / dy ** 2)
+
+
+def _second_difference(n: int, h: float, neumann: tuple = (False, False)):
+    """Second difference on n interior nodes; a Neumann end folds the edge
+    node u_edge = u_inner + h*g into its neighbour's row."""
+    main = np.full(n, -2.0)
+    main[0] += neumann[0]
+    main[-1] += neumann[1]
+    return diags([np.ones(n - 1), main, np.ones(n - 1)], [-1, 0, 1]) / h ** 2
+
+
+class _Boundary:
+    """Applies boundary conditions to the edges of a full grid."""
+
+    SIDES_1D = ("left", "right")
+    SIDES_2D = ("left", "right", "bottom", "top")
+
+    def __init__(self, spec: dict, x: np.ndarray, y: np.ndarray = None):
+        spec = spec or {}
+        self.x, self.y = x, y
+        self.dx = x[1] - x[0]
+        self.dy = None if y is None else y[1] - y[0]
+        sides = self.SIDES_1D if y is None else self.SIDES_2D
+        unknown = set(spec) - set(sides)
+        if unknown:
+            raise ValueError(f"Unknown boundary side(s): {', '.join(sorted(unknown))}")
+
+        names = ("x", "t") if y is None else ("x", "y", "t")
+        self.rules = {}
+        for side in sides:
+            rule = spec.get(side) or {}
+            kind = rule.get("type", "dirichlet").lower()
+            if kind not in ("dirichlet", "neumann"):
+                raise ValueError(f"Boundary type must be 'dirichlet' or 'neumann', got '{kind}'")
+            self.rules[side] = (kind, _field(rule.get("value", "0"), names))
+
+    def _coords(self, side):
+        x, y = self.x, self.y
+        if y is None:
+            return (x[:1],) if side == "left" else (x[-1:],)
+        if side == "left":
+            return np.full_like(y, x[0]), y
+        if side == "right":
+            return np.full_like(y, x[-1]), y
+        if side == "bottom":
+            return x, np.full_like(x, y[0])
+        return x, np.full_like(x, y[-1])
+
+    def apply(self, u: np.ndarray, t: float) -> np.ndarray:
+        """Set the boundary nodes of u in place for time t."""
+        for side, (kind, g) in self.rules.items():
+            coords = self._coords(side)
+            value = g(*coords, np.full_like(coords[0], t))
+            if u.ndim == 1:
+                edge, inner = (0, 1) if side == "left" else (-1, -2)
+                u[edge] = value[0] if kind == "dirichlet" else u[inner] + self.dx * value[0]
+                continue
+            h = self.dx if side in ("left", "right") else self.dy
+            edge = {"left": (slice(None), 0), "right": (slice(None), -1),
+                    "bottom": (0, slice(None)), "top": (-1, slice(None))}[side]
+            inner = {"left": (slice(None), 1), "right": (slice(None), -2),
+                     "bottom": (1, slice(None)), "top": (-2, slice(None))}[side]
+            u[edge] = value if kind == "dirichlet" else u[inner] + h * value
+        return u
+
+    def neumann(self, *sides) -> tuple:
+        return tuple(self.rules[side][0] == "neumann" for side in sides)
+
+    def contribution(self, shape: tuple, t: float) -> np.ndarray:
+        """Constant part of the Laplacian on the interior at time t.
+
+        Dirichlet edges contribute g/h^2. Neumann edges are part of the
+        implicit operator (see _second_difference) and leave g/h.
+        """
+        w = np.zeros(shape)
+        for side, (kind, g) in self.rules.items():
+            coords = self._coords(side)
+            value = g(*coords, np.full_like(coords[0], t))
+            h = self.dx if side in ("left", "right") else self.dy
+            if kind == "neumann":
+                value = h * value
+            if w.ndim == 1:
+                w[0 if side == "left" else -1] = value[0]
+            else:
+                edge = {"left": (slice(None), 0), "right": (slice(None), -1),
+                        "bottom": (0, slice(None)), "top": (-1, slice(None))}[side]
+                w[edge] = value
+        return _laplacian(w, *((self.dx,) if w.ndim == 1 else (self.dx, self.dy)))
+
+
+def stability_limit(equation: str, coefficient: float, spacing: tuple) -> float:
+    """Largest stable time step of the explicit scheme (CFL condition)."""
+    inv_h2 = sum(1.0 / h ** 2 for h in spacing)
+    if equation == "wave":
+        return 1.0 / (abs(coefficient) * math.sqrt(inv_h2))
+    return 0.5 / (abs(coefficient) * inv_h2)
+
+
+def _compact(u: np.ndarray) -> list:
+    """Round to six significant digits and map non-finite values to None."""
+    finite = np.isfinite(u)
+    scale = np.max(np.abs(u[finite])) if finite.any() else 0.0
+    decimals = max(0, 6 - int(np.ceil(np.log10(scale)))) if scale > 0 else 6
+    obj = np.round(u, decimals).astype(object)
+    obj[~finite] = None
+    return obj.tolist()
+
+
+def solve_pde(equation: str = "heat", coefficient: float = 1.0,
+              x_range: tuple = (0.0, 1.0), y_range: tuple = None,
+              nx: int = 101, ny: int = 101, t_max: float = 1.0, dt: float = None,
+              scheme: str = "explicit", initial: str = "sin(pi*x)",
+              initial_velocity: str = "0", boundary: dict = None,
+              frame_every: int = None) -> tuple:
+    """Set up a heat or wave simulation.
+
+    Returns (meta, frames) where meta describes the grid and time stepping
+    and frames is a generator of {"t", "u"} dicts, one every `frame_every`
+    steps (including t = 0). Invalid input raises ValueError here, before
+    any frame is computed.
+    """
+    equation = equation.lower()
+    scheme = {"cn": "crank-nicolson", "implicit": "crank-nicolson"}.get(scheme.lower(), scheme.lower())
+    if equation not in EQUATIONS:
+        raise ValueError(f"Equation must be one of {', '.join(EQUATIONS)}")
+    if scheme not in SCHEMES:
+        raise ValueError(f"Scheme must be one of {', '.join(SCHEMES)}")
+    if coefficient <= 0 or t_max <= 0:
+        raise ValueError("Coefficient and t_max must be positive")
+
+    two_d = y_range is not None
+    if nx < 3 or (two_d and ny < 3):
+        raise ValueError("Grids need at least 3 points per axis")
+    if (nx * ny if two_d else nx) > (MAX_POINTS_2D if two_d else MAX_POINTS_1D):
+        raise ValueError("Grid too large")
+
+    x = np.linspace(x_range[0], x_range[1], nx)
+    y = np.linspace(y_range[0], y_range[1], ny) if two_d else None
+    spacing = (x[1] - x[0],) if not two_d else (x[1] - x[0], y[1] - y[0])
+    if min(spacing) <= 0:
+        raise ValueError("Range minimum must be less than maximum")
+
+    limit = stability_limit(equation, coefficient, spacing)
+    if dt is None:
+        dt = 0.9 * limit if scheme == "explicit" else t_max / DEFAULT_IMPLICIT_STEPS
+    elif dt <= 0:
+        raise ValueError("dt must be positive")
+    elif scheme == "explicit" and dt > limit:
+        raise ValueError(
+            f"dt={dt:g} violates the CFL stability limit {limit:g} of the explicit scheme; "
+            f"reduce dt or use scheme='crank-nicolson'"
+        )
+    steps = math.ceil(t_max / dt - 1e-9)
+    if steps > MAX_STEPS:
+        raise ValueError(f"{steps} time steps exceed the limit of {MAX_STEPS}")
+    if (nx * ny if two_d else nx) * steps > MAX_WORK:
+        raise ValueError(
+            f"{steps} time steps on this grid exceed the work limit; use a coarser "
+            f"grid, a shorter t_max or a larger dt (scheme='crank-nicolson')"
+        )
+    dt = t_max / steps
+    frame_every = frame_every or max(1, steps // DEFAULT_FRAMES)
+    if frame_every < 1:
+        raise ValueError("frame_every must be at least 1")
+
+    names = ("x", "t") if not two_d else ("x", "y", "t")
+    grid = (x,) if not two_d else np.meshgrid(x, y, indexing="xy")
+    bc = _Boundary(boundary, x, y)
+    u0 = np.array(_field(initial, names)(*grid, np.zeros_like(grid[0])), dtype=float)
+    v0 = None
+    if equation == "wave":
+        v0 = np.array(_field(initial_velocity, names)(*grid, np.zeros_like(grid[0])), dtype=float)
+
+    meta = {
+        "equation": equation,
+        "scheme": scheme,
+        "coefficient": coefficient,
+        "x": x.tolist(),
+        "y": y.tolist() if two_d else None,
+        "dt": dt,
+        "steps": steps,
+        "frame_every": frame_every,
+        "frames": steps // frame_every + 1 + (1 if steps % frame_every else 0),
+        "stability_limit": limit,
+        "courant": dt / limit,
+    }
+    stepper = _crank_nicolson if scheme == "crank-nicolson" else _explicit
+    frames = _frames(stepper(equation, coefficient, u0, v0, bc, spacing, dt), dt, steps, frame_every)
+    return meta, frames
+
+
+def _frames(states, dt, steps, frame_every):
+    for n, u in enumerate(states):
+        if n % frame_every == 0 or n == steps:
+            yield {"t": round(n * dt, 12), "u": _compact(u)}
+        if n == steps:
+            return
+
+
+def _explicit(equation, k, u0, v0, bc, spacing, dt):
+    """FTCS (heat) or leapfrog (wave); yields the full grid at each step."""
+    u = bc.apply(u0.copy(), 0.0)
+    inner = (slice(1, -1),) * u.ndim
+    yield u
+    t = 0.0
+    if equation != "wave":
+        while True:
+            u[inner] += dt * k * _laplacian(u, *spacing)
+            t += dt
+            yield bc.apply(u, t)
+
+    r = (k * dt) ** 2
+    prev = u.copy()
+    # Taylor ghost level u(-dt) so the first step uses the initial velocity.
+    prev[inner] = u[inner] - dt * v0[inner] + 0.5 * r * _laplacian(u, *spacing)
+    while True:
+        nxt = u.copy()
+        nxt[inner] = 2 * u[inner] - prev[inner] + r * _laplacian(u, *spacing)
+        prev, u = u, nxt
+        t += dt
+        yield bc.apply(u, t)
+
+
+def _crank_nicolson(equation, k, u0, v0, bc, spacing, dt):
+    """Crank-Nicolson (heat) or average-acceleration Newmark (wave) steps.
+
+    Both solve (I - theta*L) u_new = rhs with a matrix factored once. L
+    includes the Neumann edges, so they are coupled implicitly; only the
+    known parts of the boundary conditions go to the right-hand side.
+    """
+    theta = k * dt / 2 if equation != "wave" else (k * dt) ** 2 / 4
+    u = bc.apply(u0.copy(), 0.0)
+    inner = (slice(1, -1),) * u.ndim
+    shape = u[inner].shape
+
+    if u.ndim == 1:
+        n = shape[0]
+        h2 = spacing[0] ** 2
+        ab = np.empty((3, n))
+        ab[0], ab[1], ab[2] = -theta / h2, 1 + 2 * theta / h2, -theta / h2
+        ab[0, 0] = ab[2, -1] = 0.0
+        left, right = bc.neumann("left", "right")
+        ab[1, 0] -= left * theta / h2
+        ab[1, -1] -= right * theta / h2
+
+        def solve(rhs):
+            return solve_banded((1, 1), ab, rhs)
+    else:
+        ny, nx = shape
+        L = (kron(identity(ny), _second_difference(nx, spacing[0], bc.neumann("left", "right")))
+             + kron(_second_difference(ny, spacing[1], bc.neumann("bottom", "top")),
+                    identity(nx)))
+        lu = splu((identity(nx * ny) - theta * L).tocsc())
+
+        def solve(rhs):
+            return lu.solve(rhs.ravel()).reshape(shape)
+
+    yield u
+    t = 0.0
+    if equation != "wave":
+        while True:
+            nxt = u.copy()
+            b = bc.contribution(u.shape, t + dt)
+            rhs = u[inner] + theta * _laplacian(u, *spacing) + theta * b
+            nxt[inner] = solve(rhs)
+            u = bc.apply(nxt, t + dt)
+            t += dt
+            yield u
+
+    prev = u.copy()
+    prev[inner] = u[inner] - dt * v0[inner] + 2 * theta * _laplacian(u, *spacing)
+    while True:
+        nxt = u.copy()
+        b = bc.contribution(u.shape, t + dt)
+        rhs = (2 * u[inner] - prev[inner]
+               + theta * _laplacian(2 * u + prev, *spacing) + theta * b)
+        nxt[inner] = solve(rhs)
+        prev, u = u, bc.apply(nxt, t + dt)
+        t += dt
+        yield u
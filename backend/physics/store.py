@@ -0,0 +1,228 @@
+"""Persistent result store for deterministic physics simulations.
+
+Simulation results are pure functions of their parameters, so they are
+computed once and shared by every worker process through a SQLite database.
+Each entry holds the gzip-compressed JSON body ready to be sent as-is, plus
+a strong ETag derived from its content. The least recently used entries are
+evicted once the total compressed size exceeds the configured limit.
+
+Stored bodies are served with a public Cache-Control, so the database must
+not be writable by anyone else: it is created with mode 0600 in a 0700
+directory, and a file owned by another user disables the store.
+
+Configuration (environment):
+    EULERSPACE_RESULT_STORE     database path, or "none" to disable
+                                (default: $XDG_CACHE_HOME/eulerspace/results.sqlite3,
+                                i.e. ~/.cache/eulerspace/results.sqlite3)
+    EULERSPACE_RESULT_STORE_MB  size limit in megabytes (default: 256)
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+# Bump when a simulation's output format changes to invalidate old entries.
+STORE_VERSION = 1
+
+# Only refresh an entry's access time if it is older than this (seconds),
+# so hot entries do not turn every read into a write.
+_TOUCH_INTERVAL = 60.0
+
+
+def normalize_key(name: str, params: dict) -> str:
+    """Build a canonical key from a simulation name and its parameters."""
+    def norm(value):
+        if isinstance(value, bool) or value is None or isinstance(value, str):
+            return value
+        if isinstance(value, (int, float)):
+            return repr(float(value))
+        if isinstance(value, dict):
+            return {k: norm(v) for k, v in value.items()}
+        if isinstance(value, (list, tuple)):
+            return [norm(v) for v in value]
+        return str(value)
+
+    return json.dumps(
+        {"v": STORE_VERSION, "sim": name, "params": norm(params)},
+        sort_keys=True, separators=(",", ":"),
+    )
+
+
+def encode_result(result: dict) -> tuple:
+    """Serialize a result to (gzip body, strong ETag).
+
+    NaN and Infinity are not valid JSON; they raise ValueError rather than
+    producing a body that would be cached and served to every client.
+    """
+    raw = json.dumps(result, separators=(",", ":"), allow_nan=False).encode()
+    etag = '"' + hashlib.sha256(raw).hexdigest()[:32] + '"'
+    return gzip.compress(raw, compresslevel=6, mtime=0), etag
+
+
+class ResultStore:
+    """SQLite-backed key/value store shared between worker processes."""
+
+    def __init__(self, path: str, max_bytes: int):
+        self.path = path
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = None
+        self._pid = None
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections must not be shared across fork(); reopen per process.
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10.0, check_same_thread=False,
+                                   isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " key TEXT PRIMARY KEY,"
+                " etag TEXT NOT NULL,"
+                " body BLOB NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " last_access REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS results_lru ON results(last_access)")
+            self._conn, self._pid = conn, os.getpid()
+        return self._conn
+
+    def etag(self, key: str):
+        """Return the stored ETag for a key, or None."""
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT etag FROM results WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def get(self, key: str):
+        """Return (gzip body, ETag) for a key, or None."""
+        now = time.time()
+        with self._lock:
+            conn = self._connect()
+            row = conn.execute(
+                "SELECT body, etag, last_access FROM results WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if now - row[2] > _TOUCH_INTERVAL:
+                conn.execute("UPDATE results SET last_access = ? WHERE key = ?", (now, key))
+        return row[0], row[1]
+
+    def put(self, key: str, body: bytes, etag: str):
+        """Store an entry and evict least recently used ones over the size limit."""
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO results (key, etag, body, size, last_access)"
+                " VALUES (?, ?, ?, ?, ?)",
+                (key, etag, body, len(body), time.time()),
+            )
+            total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM results").fetchone()[0]
+            if total > self.max_bytes:
+                self._evict(conn, total - self.max_bytes)
+
+    def _evict(self, conn: sqlite3.Connection, excess: int):
+        freed = 0
+        victims = []
+        for key, size in conn.execute("SELECT key, size FROM results ORDER BY last_access"):
+            if freed >= excess:
+                break
+            victims.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM results WHERE key = ?", victims)
+
+    def clear(self):
+        with self._lock:
+            self._connect().execute("DELETE FROM results")
+
+
+_store = None
+_store_lock = threading.Lock()
+_refused = None  # path of a database we may not use
+
+
+def default_path() -> str:
+    cache = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    if not os.path.isabs(cache):
+        user = os.getuid() if hasattr(os, "getuid") else os.getpid()
+        return os.path.join(tempfile.gettempdir(), f"eulerspace-{user}", "results.sqlite3")
+    return os.path.join(cache, "eulerspace", "results.sqlite3")
+
+
+def _owned_database(path: str) -> bool:
+    """Create the database file privately, or check that an existing one is ours."""
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        fd = os.open(path, os.O_RDWR | os.O_CREAT | getattr(os, "O_NOFOLLOW", 0), 0o600)
+        try:
+            info = os.fstat(fd)
+        finally:
+            os.close(fd)
+    except OSError:
+        return False
+    if hasattr(os, "getuid") and info.st_uid != os.getuid():
+        return False
+    return True
+
+
+def get_store():
+    """Return the process-wide ResultStore, or None if disabled."""
+    global _store, _refused
+    path = os.environ.get("EULERSPACE_RESULT_STORE")
+    if path is None:
+        path = default_path()
+    if path.strip().lower() in ("", "none", "off") or path == _refused:
+        return None
+    with _store_lock:
+        if _store is None or _store.path != path:
+            if not _owned_database(path):
+                _refused = path
+                return None
+            max_mb = float(os.environ.get("EULERSPACE_RESULT_STORE_MB", "256"))
+            _store = ResultStore(path, int(max_mb * 1024 * 1024))
+    return _store
+
+
+def cached_result(name: str, params: dict, compute, known_etags=()):
+    """Fetch a simulation result from the store, computing it on a miss.
+
+    Returns (gzip body, ETag). If the ETag is in `known_etags` (None, ETag)
+    is returned, so callers can answer 304. Results are deterministic and
+    the ETag derives from the content, so this also holds for results just
+    computed because the store is disabled or the entry was evicted.
+    """
+    store = get_store()
+    if store is None:
+        return _unless_known(encode_result(compute(**params)), known_etags)
+
+    key = normalize_key(name, params)
+    try:
+        if known_etags:
+            etag = store.etag(key)
+            if etag is not None and etag in known_etags:
+                return None, etag
+        hit = store.get(key)
+    except sqlite3.Error:
+        hit = None  # a busy or broken store must not fail the request
+    if hit is not None:
+        return hit
+
+    body, etag = encode_result(compute(**params))
+    try:
+        store.put(key, body, etag)
+    except sqlite3.Error:
+        pass
+    return _unless_known((body, etag), known_etags)
+
+
+def _unless_known(result: tuple, known_etags) -> tuple:
+    body, etag = result
+    return (None, etag) if etag in known_etags else (body, etag)
@@ -0,0 +1,257 @@
+"""Quantum algorithms on top of the state-vector simulator."""
+
+import math
+from fractions import Fraction
+
+import numpy as np
+
+from backend.quantum.statevector import (
+    MAX_CIRCUIT_QUBITS, StateVector, check_work, describe_state, gate_matrix, sample_counts,
+)
+
+# Shor's register needs no matmul scratch (one FFT along the counting axis),
+# so it may use one qubit more than a general circuit: N up to 128.
+MAX_SHOR_QUBITS = MAX_CIRCUIT_QUBITS + 1
+
+
+def _check_qubits(n_qubits: int, limit: int = MAX_CIRCUIT_QUBITS):
+    if not 1 <= n_qubits <= limit:
+        raise ValueError(f"Number of qubits must be between 1 and {limit}")
+
+
+def grover_search(n_qubits: int, marked: list, iterations: int = None,
+                  shots: int = 1024, seed: int = None) -> dict:
+    """Grover search for the marked basis states.
+
+    The oracle flips the sign of the marked amplitudes and the diffusion
+    operator H^n (2|0><0| - I) H^n is applied in its closed form,
+    psi -> 2 * mean(psi) - psi, which costs one pass over the state.
+    """
+    _check_qubits(n_qubits)
+    N = 2 ** n_qubits
+    marked = sorted({int(m) for m in marked})
+    if not marked or marked[0] < 0 or marked[-1] >= N:
+        raise ValueError(f"Marked states must be between 0 and {N - 1}")
+    if iterations is None:
+        iterations = max(1, int(math.floor(math.pi / 4 * math.sqrt(N / len(marked)))))
+    if iterations < 0 or iterations > 10 * int(math.sqrt(N)) + 10:
+        raise ValueError("Iteration count out of range")
+    check_work(iterations, n_qubits, "Grover search")
+
+    state = StateVector(n_qubits)
+    psi = state.data
+    psi[:] = 1 / math.sqrt(N)
+    history = [float(np.sum(np.abs(psi[marked]) ** 2))]
+    for _ in range(iterations):
+        psi[marked] *= -1
+        mean = psi.mean()
+        np.subtract(2 * mean, psi, out=psi)
+        history.append(float(np.sum(np.abs(psi[marked]) ** 2)))
+
+    rng = np.random.default_rng(seed)
+    result = {
+        "n_qubits": n_qubits,
+        "marked": [format(m, f"0{n_qubits}b") for m in marked],
+        "iterations": iterations,
+        "success_probability": history,
+        "counts": sample_counts(state.probabilities(), shots, n_qubits, rng),
+    }
+    result.update(describe_state(state))
+    return result
+
+
+def qft_gates(qubits: list, inverse: bool = False) -> list:
+    """Circuit for the quantum Fourier transform on `qubits` (first = MSB)."""
+    gates = []
+    n = len(qubits)
+    for i in range(n):
+        gates.append({"gate": "H", "qubit": qubits[i]})
+        for j in range(i + 1, n):
+            gates.append({"gate": "CP", "control": qubits[j], "target": qubits[i],
+                          "theta": math.pi / 2 ** (j - i)})
+    for i in range(n // 2):
+        gates.append({"gate": "SWAP", "qubits": [qubits[i], qubits[n - 1 - i]]})
+    if inverse:
+        gates = [dict(g, theta=-g["theta"]) if "theta" in g else g for g in reversed(gates)]
+    return gates
+
+
+def quantum_fourier_transform(n_qubits: int, input_state: int = 0, inverse: bool = False,
+                              shots: int = 0, seed: int = None) -> dict:
+    """Apply the QFT circuit (H, controlled phases, swaps) to a basis state."""
+    _check_qubits(n_qubits)
+    state = StateVector(n_qubits, input_state)
+    for g in qft_gates(list(range(n_qubits)), inverse):
+        if g["gate"] == "SWAP":
+            state.swap(*g["qubits"])
+        elif g["gate"] == "CP":
+            state.apply(gate_matrix("P", g["theta"]), g["target"], (g["control"],))
+        else:
+            state.apply(gate_matrix(g["gate"]), g["qubit"])
+
+    rng = np.random.default_rng(seed)
+    result = {
+        "n_qubits": n_qubits,
+        "input_state": format(input_state, f"0{n_qubits}b"),
+        "inverse": inverse,
+        "gate_count": n_qubits * (n_qubits + 1) // 2 + n_qubits // 2,
+        "counts": sample_counts(state.probabilities(), shots, n_qubits, rng),
+    }
+    result.update(describe_state(state))
+    return result
+
+
+def shor_period_finding(N: int, a: int = None, shots: int = 16, seed: int = None) -> dict:
+    """Quantum period finding for f(x) = a^x mod N, and the factors it yields.
+
+    The counting register of t = 2*ceil(log2 N) qubits is put in uniform
+    superposition and entangled with a work register holding a^x mod N
+    (written directly, rather than through modular-multiplication gates).
+    The inverse QFT on the counting register is applied as an orthonormal
+    FFT along that axis, which is the same unitary. Measured phases s/2^t
+    are turned into period candidates with continued fractions.
+    """
+    if N < 3:
+        raise ValueError("N must be at least 3")
+    rng = np.random.default_rng(seed)
+    m = max(1, math.ceil(math.log2(N)))
+    t = 2 * m
+    if t + m > MAX_SHOR_QUBITS:
+        raise ValueError(f"N={N} needs {t + m} qubits; the limit is {MAX_SHOR_QUBITS}")
+    if N % 2 == 0:
+        return {"N": N, "a": 2, "factors": [2, N // 2], "note": "N is even"}
+
+    if a is None:
+        while True:
+            a = int(rng.integers(2, N))
+            if math.gcd(a, N) == 1:
+                break
+    a = int(a)
+    if not 1 < a < N:
+        raise ValueError("a must satisfy 1 < a < N")
+    g = math.gcd(a, N)
+    if g != 1:
+        return {"N": N, "a": a, "factors": sorted([g, N // g]),
+                "note": "a shares a factor with N; no quantum step needed"}
+
+    T = 2 ** t
+    # f(x) = a^x mod N for every x, by doubling: f(x + k) = f(x) * a^k mod N.
+    f = np.empty(T, dtype=np.int64)
+    f[0] = 1
+    k, ak = 1, a % N
+    while k < T:
+        f[k:2 * k] = (f[:k] * ak) % N
+        ak = ak * ak % N
+        k *= 2
+
+    state = StateVector(t + m)
+    psi = state.data.reshape(T, 2 ** m)
+    psi[np.arange(T), f] = 1 / math.sqrt(T)
+    psi[:] = np.fft.fft(psi, axis=0, norm="ortho")
+
+    counting = state.marginal(list(range(t)))
+    counts = sample_counts(counting, shots, t, rng)
+
+    measurements = []
+    period = None
+    for bits in sorted(counts, key=counts.get, reverse=True):
+        s = int(bits, 2)
+        frac = Fraction(s, T).limit_denominator(N)
+        r = frac.denominator
+        # Small multiples cover the case where s/T reduced to a divisor of r.
+        found = next((r * j for j in range(1, 5) if pow(a, r * j, N) == 1), None)
+        measurements.append({"value": s, "bits": bits, "count": counts[bits],
+                             "phase": s / T, "fraction": f"{frac.numerator}/{frac.denominator}",
+                             "period_candidate": found})
+        if found is not None and (period is None or found < period):
+            period = found
+
+    if period is not None:
+        # A multiple of the order also satisfies a^r = 1; strip extra factors.
+        rest, p, primes = period, 2, []
+        while p * p <= rest:
+            if rest % p == 0:
+                primes.append(p)
+                while rest % p == 0:
+                    rest //= p
+            p += 1
+        if rest > 1:
+            primes.append(rest)
+        for p in primes:
+            while period % p == 0 and pow(a, period // p, N) == 1:
+                period //= p
+
+    factors = None
+    if period is not None and period % 2 == 0:
+        half = pow(a, period // 2, N)
+        if half != N - 1:
+            p = math.gcd(half - 1, N)
+            q = math.gcd(half + 1, N)
+            factors = sorted({p, q} - {1, N}) or None
+
+    return {
+        "N": N,
+        "a": a,
+        "counting_qubits": t,
+        "work_qubits": m,
+        "period": period,
+        "factors": factors,
+        "measurements": measurements,
+        "note": None if factors else "Unlucky choice of a or measurements; retry with another a or seed",
+    }
+
+
+def bb84(n_bits: int = 32, eavesdrop: bool = False, sample_fraction: float = 0.25,
+         seed: int = None) -> dict:
+    """Simulate the BB84 key exchange, optionally with an intercept-resend Eve.
+
+    Each photon is one qubit measured independently, so all of them are
+    simulated at once with NumPy arrays: measuring in the preparation basis
+    returns the encoded bit, measuring in the other basis a fair coin.
+    """
+    if not 1 <= n_bits <= 100000:
+        raise ValueError("n_bits must be between 1 and 100000")
+    rng = np.random.default_rng(seed)
+    alice_bits = rng.integers(0, 2, n_bits)
+    alice_bases = rng.integers(0, 2, n_bits)  # 0 = '+', 1 = 'x'
+    bob_bases = rng.integers(0, 2, n_bits)
+
+    sent_bits, sent_bases = alice_bits, alice_bases
+    eve_bases = None
+    if eavesdrop:
+        eve_bases = rng.integers(0, 2, n_bits)
+        eve_bits = np.where(eve_bases == alice_bases, alice_bits, rng.integers(0, 2, n_bits))
+        sent_bits, sent_bases = eve_bits, eve_bases
+
+    bob_bits = np.where(bob_bases == sent_bases, sent_bits, rng.integers(0, 2, n_bits))
+    match = alice_bases == bob_bases
+    sifted = np.flatnonzero(match)
+
+    n_check = int(len(sifted) * sample_fraction)
+    check = rng.choice(sifted, n_check, replace=False) if n_check else np.array([], dtype=int)
+    errors = int(np.sum(alice_bits[check] != bob_bits[check]))
+    qber = errors / n_check if n_check else 0.0
+    key_idx = np.setdiff1d(sifted, check)
+
+    basis = np.array(["+", "x"])
+    rows = None
+    if n_bits <= 256:
+        rows = [
+            {"aliceBit": int(alice_bits[i]), "aliceBasis": str(basis[alice_bases[i]]),
+             "bobBasis": str(basis[bob_bases[i]]), "match": bool(match[i]),
+             "bobResult": int(bob_bits[i]),
+             **({"eveBasis": str(basis[eve_bases[i]])} if eavesdrop else {})}
+            for i in range(n_bits)
+        ]
+
+    return {
+        "n_bits": n_bits,
+        "eavesdrop": eavesdrop,
+        "sifted_length": int(len(sifted)),
+        "checked_bits": n_check,
+        "errors": errors,
+        "qber": qber,
+        "secure": qber < 0.11,
+        "key": "".join(map(str, alice_bits[key_idx][:1024])),
+        "bits": rows,
+    }
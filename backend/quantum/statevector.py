@@ -0,0 +1,290 @@
+"""State-vector quantum circuit simulator.
+
+The state of n qubits is a contiguous complex128 array of length 2**n,
+viewed as an n-dimensional (2, 2, ..., 2) tensor with qubit 0 on the first
+(most significant) axis, so basis labels read |q0 q1 ... q(n-1)>. No 2**n
+matrix is ever built: an uncontrolled gate is a batched 2x2 matmul over the
+(2**q, 2, rest) reshape of the state, written into a scratch buffer of the
+same size, and a k-controlled gate is applied in place to the strided view
+of the 2**(n-k) amplitudes whose controls are 1. Runs of single-qubit gates on the same qubit are
+fused into one 2x2 matrix before execution.
+
+Circuit format (list of dicts, as used by the Quantum Lab):
+
+    {"gate": "H", "qubit": 0}
+    {"gate": "RX", "qubit": 1, "theta": 1.57}
+    {"gate": "CNOT", "control": 0, "target": 1}
+    {"gate": "CP", "control": 0, "target": 2, "theta": 0.785}
+    {"gate": "CCX", "controls": [0, 1], "target": 2}
+    {"gate": "SWAP", "qubits": [0, 2]}
+    {"gate": "M", "qubit": 0}
+
+"M" marks a qubit for readout. Measurements are deferred to the end of the
+circuit, so counts are reported for the measured qubits only (all qubits
+if none are marked).
+"""
+
+import numpy as np
+
+MAX_QUBITS = 24
+MAX_SHOTS = 1_000_000
+MAX_AMPLITUDE_QUBITS = 12
+
+# Per-request limits. A simulation holds a few arrays the size of the state
+# (amplitudes, matmul scratch, probabilities and their cumulative sum): about
+# 60 MB at 20 qubits, but 900 MB at MAX_QUBITS.
+MAX_CIRCUIT_QUBITS = 20
+# Amplitude updates per request, i.e. full-state passes times 2**n: at most
+# a few seconds of NumPy work.
+MAX_WORK = 1 << 28
+
+_SQRT2_INV = 1 / np.sqrt(2)
+
+FIXED_GATES = {
+    "I": np.eye(2, dtype=complex),
+    "H": np.array([[_SQRT2_INV, _SQRT2_INV], [_SQRT2_INV, -_SQRT2_INV]], dtype=complex),
+    "X": np.array([[0, 1], [1, 0]], dtype=complex),
+    "Y": np.array([[0, -1j], [1j, 0]], dtype=complex),
+    "Z": np.diag([1, -1]).astype(complex),
+    "S": np.diag([1, 1j]),
+    "SDG": np.diag([1, -1j]),
+    "T": np.diag([1, np.exp(1j * np.pi / 4)]),
+    "TDG": np.diag([1, np.exp(-1j * np.pi / 4)]),
+}
+
+# Controlled gate name -> target single-qubit gate.
+CONTROLLED = {"CNOT": "X", "CX": "X", "CY": "Y", "CZ": "Z", "CP": "P",
+              "CCX": "X", "TOFFOLI": "X", "CCZ": "Z"}
+
+
+def gate_matrix(name: str, theta: float = None) -> np.ndarray:
+    """2x2 unitary of a single-qubit gate."""
+    name = name.upper()
+    if name in FIXED_GATES:
+        return FIXED_GATES[name]
+    if name not in ("RX", "RY", "RZ", "P", "PHASE"):
+        raise ValueError(f"Unknown gate '{name}'")
+    if theta is None:
+        raise ValueError(f"Gate {name} needs a 'theta' parameter")
+    c, s = np.cos(theta / 2), np.sin(theta / 2)
+    if name == "RX":
+        return np.array([[c, -1j * s], [-1j * s, c]])
+    if name == "RY":
+        return np.array([[c, -s], [s, c]], dtype=complex)
+    if name == "RZ":
+        return np.diag([np.exp(-1j * theta / 2), np.exp(1j * theta / 2)])
+    return np.diag([1, np.exp(1j * theta)])
+
+
+def _is_diagonal(U: np.ndarray) -> bool:
+    return U[0, 1] == 0 and U[1, 0] == 0
+
+
+class StateVector:
+    """n-qubit pure state stored as a flat complex128 array."""
+
+    def __init__(self, n_qubits: int, basis_state: int = 0):
+        if not 1 <= n_qubits <= MAX_QUBITS:
+            raise ValueError(f"Number of qubits must be between 1 and {MAX_QUBITS}")
+        if not 0 <= basis_state < 2 ** n_qubits:
+            raise ValueError("Basis state out of range")
+        self.n = n_qubits
+        self.data = np.zeros(2 ** n_qubits, dtype=np.complex128)
+        self.data[basis_state] = 1.0
+        self._scratch = None
+
+    @property
+    def tensor(self) -> np.ndarray:
+        return self.data.reshape((2,) * self.n)
+
+    def _check(self, *qubits):
+        for q in qubits:
+            if not 0 <= q < self.n:
+                raise ValueError(f"Qubit {q} out of range for {self.n} qubits")
+        if len(set(qubits)) != len(qubits):
+            raise ValueError("A gate cannot use the same qubit twice")
+
+    def apply(self, U: np.ndarray, target: int, controls=()):
+        """Apply a (multi-)controlled single-qubit gate in place."""
+        self._check(target, *controls)
+        if not controls and not _is_diagonal(U) and target < self.n - 2:
+            # matmul beats in-place updates unless the target is one of the
+            # last qubits, where the contraction degenerates to tiny matrices.
+            shape = (2 ** target, 2, 2 ** (self.n - target - 1))
+            if self._scratch is None:
+                self._scratch = np.empty_like(self.data)
+            np.matmul(U, self.data.reshape(shape), out=self._scratch.reshape(shape))
+            self.data, self._scratch = self._scratch, self.data
+            return self
+
+        index = [slice(None)] * self.n
+        for c in controls:
+            index[c] = 1
+        view = self.tensor[tuple(index)]
+        axis = target - sum(1 for c in controls if c < target)
+
+        # Length-1 slices (not integers) so v0/v1 stay views even when 1-D.
+        lead = (slice(None),) * axis
+        v0, v1 = view[lead + (slice(0, 1),)], view[lead + (slice(1, 2),)]
+        if _is_diagonal(U):
+            if U[0, 0] != 1:
+                v0 *= U[0, 0]
+            if U[1, 1] != 1:
+                v1 *= U[1, 1]
+            return self
+        a = v0.copy()
+        v0 *= U[0, 0]
+        v0 += U[0, 1] * v1
+        v1 *= U[1, 1]
+        v1 += U[1, 0] * a
+        return self
+
+    def swap(self, q1: int, q2: int):
+        self._check(q1, q2)
+        index01 = [slice(None)] * self.n
+        index10 = [slice(None)] * self.n
+        index01[q1], index01[q2] = 0, 1
+        index10[q1], index10[q2] = 1, 0
+        t = self.tensor
+        tmp = t[tuple(index01)].copy()
+        t[tuple(index01)] = t[tuple(index10)]
+        t[tuple(index10)] = tmp
+        return self
+
+    def probabilities(self) -> np.ndarray:
+        return self.data.real ** 2 + self.data.imag ** 2
+
+    def marginal(self, qubits: list) -> np.ndarray:
+        """Probabilities of the given qubits (in the given order)."""
+        probs = self.probabilities().reshape((2,) * self.n)
+        others = tuple(q for q in range(self.n) if q not in qubits)
+        reduced = probs.sum(axis=others) if others else probs
+        kept = sorted(qubits)
+        reduced = np.transpose(reduced, [kept.index(q) for q in qubits])
+        return reduced.ravel()
+
+    def bloch_vectors(self) -> list:
+        """Bloch vector (x, y, z) of each qubit's reduced state."""
+        vectors = []
+        for q in range(self.n):
+            psi = self.data.reshape(2 ** q, 2, -1)
+            a, b = psi[:, 0, :], psi[:, 1, :]
+            rho01 = np.vdot(b, a)  # <0|rho|1> = sum a * conj(b)
+            z = np.vdot(a, a).real - np.vdot(b, b).real
+            vectors.append([2 * rho01.real, -2 * rho01.imag, z])
+        return vectors
+
+
+def sample_counts(probs: np.ndarray, shots: int, n_bits: int, rng: np.random.Generator) -> dict:
+    """Draw `shots` outcomes at once and return {bitstring: count}."""
+    if not 0 <= shots <= MAX_SHOTS:
+        raise ValueError(f"Shots must be between 0 and {MAX_SHOTS}")
+    if shots == 0:
+        return {}
+    cdf = np.cumsum(probs)
+    cdf /= cdf[-1]
+    outcomes = np.searchsorted(cdf, rng.random(shots), side="right")
+    values, counts = np.unique(np.minimum(outcomes, len(probs) - 1), return_counts=True)
+    return {format(int(v), f"0{n_bits}b"): int(c) for v, c in zip(values, counts)}
+
+
+def check_work(passes: int, n_qubits: int, what: str):
+    """Refuse a simulation that would update more than MAX_WORK amplitudes."""
+    if passes * 2 ** n_qubits > MAX_WORK:
+        raise ValueError(f"{what} on {n_qubits} qubits needs {passes} passes over the state; "
+                         f"at most {MAX_WORK >> n_qubits} are allowed at this size")
+
+
+def compile_circuit(gates: list, n_qubits: int) -> tuple:
+    """Turn circuit dicts into fused operations.
+
+    Returns (ops, measured) where ops are ("u", target, controls, U) or
+    ("swap", q1, q2) tuples and measured lists qubits marked with "M".
+    """
+    ops, measured = [], []
+    pending = {}
+
+    def flush(*qubits):
+        for q in qubits:
+            U = pending.pop(q, None)
+            if U is not None and not np.allclose(U, np.eye(2)):
+                ops.append(("u", q, (), U))
+
+    for g in gates:
+        name = str(g.get("gate", "")).upper()
+        theta = g.get("theta")
+        if name == "M":
+            q = int(g["qubit"])
+            if q not in measured:
+                measured.append(q)
+        elif name == "SWAP":
+            q1, q2 = (int(q) for q in g["qubits"])
+            flush(q1, q2)
+            ops.append(("swap", q1, q2))
+        elif name in CONTROLLED:
+            controls = g.get("controls")
+            if controls is None:
+                controls = [g["control"]]
+            controls = tuple(int(c) for c in controls)
+            target = int(g["target"])
+            flush(target, *controls)
+            ops.append(("u", target, controls, gate_matrix(CONTROLLED[name], theta)))
+        else:
+            q = int(g["qubit"])
+            if not 0 <= q < n_qubits:
+                raise ValueError(f"Qubit {q} out of range for {n_qubits} qubits")
+            U = gate_matrix(name, theta)
+            pending[q] = U @ pending[q] if q in pending else U
+    flush(*list(pending))
+    return ops, measured
+
+
+def run_circuit(n_qubits: int, gates: list, shots: int = 1024,
+                initial_state: int = 0, seed: int = None) -> dict:
+    """Simulate a circuit and sample measurement counts."""
+    if not 1 <= n_qubits <= MAX_CIRCUIT_QUBITS:
+        raise ValueError(f"Number of qubits must be between 1 and {MAX_CIRCUIT_QUBITS}")
+    ops, measured = compile_circuit(gates, n_qubits)
+    check_work(len(ops), n_qubits, "The circuit")
+    state = StateVector(n_qubits, initial_state)
+    for op in ops:
+        if op[0] == "swap":
+            state.swap(op[1], op[2])
+        else:
+            state.apply(op[3], op[1], op[2])
+
+    readout = measured or list(range(n_qubits))
+    probs = state.marginal(readout) if measured else state.probabilities()
+    rng = np.random.default_rng(seed)
+    result = {
+        "n_qubits": n_qubits,
+        "gate_count": len(gates),
+        "fused_op_count": len(ops),
+        "measured_qubits": readout,
+        "counts": sample_counts(probs, shots, len(readout), rng),
+    }
+    result.update(describe_state(state))
+    return result
+
+
+def describe_state(state: StateVector, top: int = 32) -> dict:
+    """Amplitudes for small registers, otherwise the most likely basis states."""
+    probs = state.probabilities()
+    if state.n <= MAX_AMPLITUDE_QUBITS:
+        return {
+            "amplitudes": {
+                "re": np.round(state.data.real, 12).tolist(),
+                "im": np.round(state.data.imag, 12).tolist(),
+            },
+            "probabilities": np.round(probs, 12).tolist(),
+            "bloch": np.round(state.bloch_vectors(), 12).tolist(),
+        }
+    k = min(top, len(probs))
+    idx = np.argpartition(probs, -k)[-k:]
+    idx = idx[np.argsort(probs[idx])[::-1]]
+    return {
+        "top_states": [
+            {"state": format(int(i), f"0{state.n}b"), "probability": float(probs[i])}
+            for i in idx
+        ],
+    }
@@ -0,0 +1,42 @@
+"""Number theory and classical cipher helpers."""
+
+import pytest
+
+from backend.crypto.classical import shift_text, vigenere_crack
+from backend.crypto.numbertheory import rsa_keygen
+
+
+@pytest.mark.parametrize("e", [-3, 0, 1, 2, 4, 65536])
+def test_rsa_keygen_rejects_unusable_exponents(e):
+    with pytest.raises(ValueError):
+        rsa_keygen(64, e)
+
+
+@pytest.mark.parametrize("e", [3, 17, 65537])
+def test_rsa_keygen_inverts_e(e):
+    key = rsa_keygen(128, e, seed=3)
+    p, q, d = int(key["p"]), int(key["q"]), int(key["d"])
+    assert int(key["n"]) == p * q
+    assert d * e % ((p - 1) * (q - 1)) == 1
+
+
+@pytest.mark.parametrize("text", ["The quick brown fox jumps", "abcdefghij", "ab"])
+def test_vigenere_crack_handles_short_text(text):
+    result = vigenere_crack(text)
+    assert len(result["key"]) == result["key_length"] >= 1
+
+
+def test_vigenere_crack_recovers_key():
+    plaintext = (
+        "It was the best of times, it was the worst of times, it was the age of wisdom, "
+        "it was the age of foolishness, it was the epoch of belief, it was the epoch of "
+        "incredulity, it was the season of Light, it was the season of Darkness, it was "
+        "the spring of hope, it was the winter of despair, we had everything before us, "
+        "we had nothing before us, we were all going direct to Heaven, we were all going "
+        "direct the other way."
+    )
+    # shift_text shifts letters back, so negated shifts encrypt.
+    ciphertext = shift_text(plaintext, [65 - ord(c) for c in "LEMON"])
+    result = vigenere_crack(ciphertext)
+    assert result["key"] == "LEMON"
+    assert result["plaintext"] == plaintext
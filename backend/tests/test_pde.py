@@ -0,0 +1,33 @@
+"""Finite-difference PDE solver checks against exact solutions."""
+
+import numpy as np
+import pytest
+
+from backend.physics.pde import solve_pde
+
+INSULATED = {"left": {"type": "neumann"}, "right": {"type": "neumann"}}
+
+
+def _heat(x, t):
+    return np.exp(-np.pi ** 2 * t) * np.cos(np.pi * x)
+
+
+def _wave(x, t):
+    return np.cos(np.pi * t) * np.cos(np.pi * x)
+
+
+@pytest.mark.parametrize("equation, scheme, dt, t_max, exact", [
+    ("heat", "explicit", None, 0.1, _heat),
+    ("heat", "crank-nicolson", 0.002, 0.1, _heat),
+    ("heat", "crank-nicolson", 0.05, 1.0, _heat),
+    ("wave", "explicit", None, 2.0, _wave),
+    ("wave", "crank-nicolson", 0.01, 2.0, _wave),
+])
+def test_insulated_ends_match_exact_solution(equation, scheme, dt, t_max, exact):
+    # u0 = cos(pi x) on [0, 1] with u_x = 0 at both ends.
+    meta, frames = solve_pde(equation, 1.0, nx=201, t_max=t_max, dt=dt, scheme=scheme,
+                             initial="cos(pi*x)", boundary=INSULATED)
+    last = list(frames)[-1]
+    x = np.array(meta["x"])
+    u = np.array(last["u"], dtype=float)
+    assert np.max(np.abs(u - exact(x, last["t"]))) < 0.02
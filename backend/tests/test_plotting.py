@@ -0,0 +1,52 @@
+"""Contour and implicit-curve extraction."""
+
+import numpy as np
+import pytest
+import sympy as sp
+
+from backend.engine.plotting import generate_contour_data, generate_implicit_data
+
+
+def _points(curve):
+    x = np.array([v for v in curve["x"] if v is not None], dtype=float)
+    y = np.array([v for v in curve["y"] if v is not None], dtype=float)
+    return x, y
+
+
+def _residual(expression, curve, level=0.0):
+    f = sp.lambdify(sp.symbols("x y"), sp.sympify(expression), "numpy")
+    x, y = _points(curve)
+    return np.max(np.abs(f(x, y) - level))
+
+
+@pytest.mark.parametrize("equation, curves", [
+    ("y - 1/x", 2),
+    ("x*y - 1", 2),
+    ("x**2 + y**2 - 4", 1),
+    ("1/(x**2 + y**2 - 4)", 0),
+])
+def test_implicit_curves_skip_poles(equation, curves):
+    for resolution in (100, 400):
+        result = generate_implicit_data(equation.replace("**", "^"), resolution=resolution)
+        assert result["curves"] == curves
+        if curves:
+            assert _residual(equation, result) < 0.05
+
+
+def test_implicit_tan_has_no_vertical_segments():
+    result = generate_implicit_data("tan(x) - y", resolution=200)
+    assert _residual("tan(x) - y", result) < 0.05
+
+
+def test_contours_do_not_follow_poles():
+    # |level - y| <= 64 here, so real points keep |cos(x)| >= sin(atan(1/64)).
+    result = generate_contour_data("tan(x) + y", resolution=200, levels=5)
+    for contour in result["contours"]:
+        x, _ = _points(contour)
+        assert contour["curves"] > 0
+        assert np.min(np.abs(np.cos(x))) > 0.01
+
+
+def test_contour_level_limit():
+    with pytest.raises(ValueError):
+        generate_contour_data("x + y", resolution=20, levels=1000)
@@ -0,0 +1,35 @@
+"""State-vector simulator results and per-request limits."""
+
+import pytest
+
+from backend.quantum.algorithms import grover_search, shor_period_finding
+from backend.quantum.statevector import MAX_CIRCUIT_QUBITS, run_circuit
+
+
+def test_grover_finds_marked_state():
+    result = grover_search(6, [37], seed=0)
+    assert result["success_probability"][-1] > 0.99
+    assert max(result["counts"], key=result["counts"].get) == format(37, "06b")
+
+
+def test_bell_state_counts():
+    gates = [{"gate": "H", "qubit": 0}, {"gate": "CNOT", "control": 0, "target": 1}]
+    counts = run_circuit(2, gates, shots=1000, seed=1)["counts"]
+    assert set(counts) == {"00", "11"}
+
+
+def test_shor_factors_15():
+    assert shor_period_finding(15, a=7, seed=0)["factors"] == [3, 5]
+
+
+@pytest.mark.parametrize("call", [
+    lambda: grover_search(MAX_CIRCUIT_QUBITS, [1]),  # default iterations exceed the budget
+    lambda: grover_search(MAX_CIRCUIT_QUBITS + 1, [1], iterations=1),
+    lambda: run_circuit(MAX_CIRCUIT_QUBITS + 1, []),
+    lambda: run_circuit(MAX_CIRCUIT_QUBITS, [{"gate": "CNOT", "control": q % 2, "target": 2}
+                                             for q in range(2000)]),
+    lambda: shor_period_finding(129),
+])
+def test_oversized_requests_are_rejected(call):
+    with pytest.raises(ValueError):
+        call()
@@ -0,0 +1,23 @@
+"""Workspace series, raised order by order, compared with sympy.series()."""
+
+import pytest
+import sympy as sp
+
+from backend.engine.symbolic import safe_parse
+from backend.engine.workspace import Workspace
+
+
+@pytest.mark.parametrize("source, point", [
+    ("x*sqrt(x)", "0"), ("x^(5/2)", "0"), ("sqrt(x)", "0"), ("sqrt(1+x)", "0"),
+    ("x^(3/2)*exp(x)", "0"), ("sqrt(x)", "1"), ("exp(sin(x))", "0"), ("tan(x)", "0"),
+    ("sin(x)/x", "0"), ("x^2*log(x)", "0"), ("log(1+x)*cos(x)", "0"), ("abs(x)+x^2", "0"),
+])
+def test_incremental_series_matches_sympy(source, point):
+    x = sp.Symbol("x")
+    workspace = Workspace()
+    workspace.set_expression("f", source)
+    for order in (1, 2, 3, 5, 8):
+        got = workspace.series("f", "x", point, order)
+        expected = sp.series(safe_parse(source), x, safe_parse(point), order)
+        difference = safe_parse(got["result"]).removeO() - expected.removeO()
+        assert sp.simplify(difference) == 0, (order, got["result"], got["source"])
@@ -0,0 +1,104 @@
+"""Worker warm-up: load the engines and prime caches before reporting ready.
+
+The steps to run are configured with the EULERSPACE_WARMUP environment
+variable, a comma-separated list of step names, or "all" (default) / "none".
+Steps run in order in a background thread, so liveness (/health) answers
+immediately while readiness (/ready) waits for the warm-up to finish.
+"""
+
+import os
+import threading
+import time
+
+STEPS = ["imports", "parser", "symbolic", "lambdify", "numeric"]
+
+state = {
+    "ready": False,
+    "steps": {},
+    "error": None,
+}
+
+_lock = threading.Lock()
+_thread = None
+
+
+def _imports():
+    import backend.engine.symbolic  # noqa: F401
+    import backend.physics.simulator  # noqa: F401
+    import backend.ai.assistant  # noqa: F401
+
+
+def _parser():
+    from backend.engine.symbolic import safe_parse
+    for expr in ["x^2 + 2x + 1", "sin(x)*cos(x)", "exp(-x^2)/sqrt(2pi)", "log(x) + 1/x"]:
+        safe_parse(expr)
+
+
+def _symbolic():
+    from backend.engine.symbolic import (
+        differentiate, integrate, simplify_expr, solve_equation, series_expansion,
+    )
+    solve_equation("x^2 - 4 = 0")
+    differentiate("x^2*sin(x)")
+    integrate("x*exp(x)")
+    simplify_expr("(x^2 - 1)/(x - 1)")
+    series_expansion("exp(x)", order=4)
+
+
+def _lambdify():
+    from backend.engine.symbolic import generate_plot_data
+    generate_plot_data("sin(x)/x", points=16)
+
+
+def _numeric():
+    from backend.physics.simulator import pendulum, electric_field_2d
+    pendulum(1.0, 10.0, t_max=0.1)
+    electric_field_2d([{"x": 0, "y": 0, "q": 1}], resolution=4)
+
+
+_STEP_FUNCS = {
+    "imports": _imports,
+    "parser": _parser,
+    "symbolic": _symbolic,
+    "lambdify": _lambdify,
+    "numeric": _numeric,
+}
+
+
+def configured_steps() -> list:
+    """Return the warm-up steps selected by EULERSPACE_WARMUP."""
+    value = os.environ.get("EULERSPACE_WARMUP", "all").strip().lower()
+    if value in ("", "all"):
+        return list(STEPS)
+    if value == "none":
+        return []
+    steps = [s.strip() for s in value.split(",") if s.strip()]
+    unknown = [s for s in steps if s not in _STEP_FUNCS]
+    if unknown:
+        raise ValueError(f"Unknown warm-up step(s): {', '.join(unknown)}")
+    return steps
+
+
+def run(steps: list = None) -> dict:
+    """Run warm-up steps synchronously and mark the worker ready."""
+    try:
+        steps = configured_steps() if steps is None else steps
+        for name in steps:
+            start = time.perf_counter()
+            _STEP_FUNCS[name]()
+            state["steps"][name] = round(time.perf_counter() - start, 4)
+    except Exception as e:
+        # A failed warm-up only costs latency; the worker can still serve.
+        state["error"] = f"{type(e).__name__}: {e}"
+    state["ready"] = True
+    return state
+
+
+def start() -> threading.Thread:
+    """Run the warm-up in a background thread (once per process)."""
+    global _thread
+    with _lock:
+        if _thread is None:
+            _thread = threading.Thread(target=run, name="eulerspace-warmup", daemon=True)
+            _thread.start()
+    return _thread
@@ -27,27 +27,111 @@ export const seriesMath = (expression, variable = 'x', point = '0', order = 6) =
 export const plotMath = (expression, variable = 'x', x_min = -10, x_max = 10) =>
   api.post('/math/plot', { expression, variable, x_min, x_max });
 
+export const surfaceMath = (expression, options = {}) =>
+  api.post('/math/surface', { expression, ...options });
+
+export const contourMath = (expression, options = {}) =>
+  api.post('/math/contour', { expression, ...options });
+
+export const implicitMath = (equation, options = {}) =>
+  api.post('/math/implicit', { equation, ...options });
+
+export const volumeMath = (expression, options = {}) =>
+  api.post('/math/volume', { expression, ...options });
+
 export const matrixMath = (matrix, operation) =>
   api.post('/math/matrix', { matrix, operation });
 
-// Physics
+// Expression workspaces (derivatives and series build on earlier results)
+export const createWorkspace = (expressions = {}) =>
+  api.post('/math/workspace', { expressions });
+
+export const getWorkspace = (id) =>
+  api.get(`/math/workspace/${id}`);
+
+export const deleteWorkspace = (id) =>
+  api.delete(`/math/workspace/${id}`);
+
+export const setWorkspaceExpression = (id, name, expression) =>
+  api.post(`/math/workspace/${id}/expressions`, { name, expression });
+
+export const workspaceDifferentiate = (id, name = 'f', variable = 'x', order = 1, simplify = false) =>
+  api.post(`/math/workspace/${id}/differentiate`, { name, variable, order, simplify });
+
+export const workspaceSeries = (id, name = 'f', variable = 'x', point = '0', order = 6) =>
+  api.post(`/math/workspace/${id}/series`, { name, variable, point, order });
+
+export const workspaceLimit = (id, name = 'f', variable = 'x', point = 'oo') =>
+  api.post(`/math/workspace/${id}/limit`, { name, variable, point });
+
+// Physics (GET so the browser can cache and revalidate via ETag)
 export const simulateProjectile = (v0, angle, g = 9.81) =>
-  api.post('/physics/projectile', { v0, angle, g });
+  api.get('/physics/projectile', { params: { v0, angle, g } });
 
 export const simulateSHM = (amplitude, omega, phi = 0, t_max = 10) =>
-  api.post('/physics/shm', { amplitude, omega, phi, t_max });
+  api.get('/physics/shm', { params: { amplitude, omega, phi, t_max } });
 
 export const simulatePendulum = (length, theta0, g = 9.81, t_max = 10) =>
-  api.post('/physics/pendulum', { length, theta0, g, t_max });
+  api.get('/physics/pendulum', { params: { length, theta0, g, t_max } });
 
 export const simulateWave = (length = 1, c = 1, n_modes = 5) =>
-  api.post('/physics/wave', { length, c, n_modes });
+  api.get('/physics/wave', { params: { length, c, n_modes } });
 
 export const simulateElectricField = (charges) =>
   api.post('/physics/electric-field', { charges });
 
 export const simulateOrbital = (params = {}) =>
-  api.post('/physics/orbital', params);
+  api.get('/physics/orbital', { params });
+
+// Response body is NDJSON: a metadata line followed by one line per frame.
+export const simulatePDE = (params = {}) =>
+  api.post('/physics/pde', params, { responseType: 'text' }).then((res) => {
+    const [meta, ...frames] = res.data.trim().split('\n').map((line) => JSON.parse(line));
+    return { ...res, data: { meta, frames } };
+  });
+
+// Quantum
+export const runQuantumCircuit = (n_qubits, gates, shots = 1024) =>
+  api.post('/quantum/circuit', { n_qubits, gates, shots });
+
+export const runGrover = (n_qubits, marked, iterations = null) =>
+  api.post('/quantum/grover', { n_qubits, marked, iterations });
+
+export const runQFT = (n_qubits, input_state, inverse = false) =>
+  api.post('/quantum/qft', { n_qubits, input_state, inverse });
+
+export const runShor = (N, a = null) =>
+  api.post('/quantum/shor', { N, a });
+
+export const runBB84 = (n_bits = 12, eavesdrop = false) =>
+  api.post('/quantum/bb84', { n_bits, eavesdrop });
+
+// Crypto (big integers are sent as strings)
+export const testPrimality = (n) =>
+  api.post('/crypto/primality', { n: String(n) });
+
+export const generatePrime = (bits = 64) =>
+  api.post('/crypto/generate-prime', { bits });
+
+export const factorInteger = (n, time_budget = 5) =>
+  api.post('/crypto/factor', { n: String(n), time_budget });
+
+export const rsaKeygen = (bits = 64, e = 65537) =>
+  api.post('/crypto/rsa-keygen', { bits, e });
+
+export const rsaBreak = (n, e = 65537, ciphertext = null, time_budget = 5) =>
+  api.post('/crypto/rsa-break', {
+    n: String(n), e, ciphertext: ciphertext === null ? null : String(ciphertext), time_budget,
+  });
+
+export const frequencyAnalysis = (text) =>
+  api.post('/crypto/frequency', { text });
+
+export const crackCaesar = (text) =>
+  api.post('/crypto/caesar-crack', { text });
+
+export const crackVigenere = (text, max_key_length = 20) =>
+  api.post('/crypto/vigenere-crack', { text, max_key_length });
 
 // AI
 export const explainMath = (expression, operation, variable = 'x') =>